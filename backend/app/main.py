@@ -18,6 +18,7 @@ LLM_ENABLED = os.getenv("LLM_ENABLED", "false").lower() == "true"
 print(f"LLM_ENABLED = {LLM_ENABLED}")
 
 from backend.app.routes import evaluate_router
+from utils.llm_service import get_llm_service
 
 app = FastAPI(
     title="Assignment Evaluation API",
@@ -65,6 +66,18 @@ async def root():
 app.include_router(evaluate_router)
 
 
+@app.on_event("startup")
+async def warm_up_llm():
+    """Send a background warm-up request so the first evaluation skips cold start."""
+    get_llm_service().warmup()
+
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    """Close the pooled Gemini connections on shutdown."""
+    await get_llm_service().aclose()
+
+
 if __name__ == "__main__":
     import uvicorn
 
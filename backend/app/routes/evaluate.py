@@ -12,7 +12,7 @@ from fastapi.responses import FileResponse
 
 from backend.app.schemas import EvaluationRequest, EvaluationResponse, RubricConfig
 from backend.app.services import EvaluatorService
-from utils.llm_service import LLMService
+from utils.llm_service import get_llm_service
 
 router = APIRouter(prefix="/api", tags=["evaluation"])
 
@@ -123,7 +123,7 @@ def evaluate(
                 # If not JSON or invalid JSON structure, treat as plain text and use LLM
                 print("Rubric JSON parse failed, attempting LLM parsing of text rubric...")
                 try:
-                    llm_service = LLMService()
+                    llm_service = get_llm_service()
                     parsed_dict = llm_service.parse_rubric_text(rubric_content)
                     if parsed_dict:
                         rubric = RubricConfig(**parsed_dict)
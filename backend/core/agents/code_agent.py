@@ -3,7 +3,7 @@ import re
 from typing import Any, Dict, List
 
 from .base_agent import EvaluationAgent
-from utils.llm_service import LLMService
+from utils.llm_service import get_llm_service
 
 
 class CodeEvaluationAgent(EvaluationAgent):
@@ -11,7 +11,7 @@ class CodeEvaluationAgent(EvaluationAgent):
 
     def __init__(self):
         super().__init__()
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.STOP_WORDS = {
             "function", "return", "class", "solution", "input", "output", "code", 
             "string", "include", "std", "write", "example", "explanation", "leetcode",
@@ -44,6 +44,8 @@ class CodeEvaluationAgent(EvaluationAgent):
                 - problem_statement (str): The coding problem
                 - rubric (dict): Evaluation criteria with weights
                 - student_code (str): The student's code submission
+                - relevance_verdict (str, optional): LLM verdict already
+                  computed for this submission (e.g. in bulk)
 
         Returns:
             Dictionary with:
@@ -55,6 +57,7 @@ class CodeEvaluationAgent(EvaluationAgent):
         rubric = input_data.get("rubric", {})
         student_code = input_data.get("student_code", "")
         filename = input_data.get("filename", "")
+        relevance_verdict = input_data.get("relevance_verdict")
 
         language = self._detect_language(student_code, filename)
 
@@ -63,7 +66,7 @@ class CodeEvaluationAgent(EvaluationAgent):
 
         # Analyze approach relevance — unpacks (score, missing_concepts, verdict) for thread safety
         approach_score, missing_concepts, relevance_verdict = self._evaluate_approach(
-            student_code, problem_statement, feedback, language
+            student_code, problem_statement, feedback, language, relevance_verdict
         )
         scores["approach"] = approach_score
 
@@ -146,9 +149,9 @@ class CodeEvaluationAgent(EvaluationAgent):
             llm_verdict = "UNCERTAIN"
             if self.llm_service.enabled:
                 llm_verdict = self.llm_service.check_relevance(problem, code, "code")
-                if llm_verdict == "IRRELEVANT":
-                    feedback.append("⚠️ LLM determined code is irrelevant to the problem. Score: 0.")
-                    return 0, [], "IRRELEVANT"
+        if llm_verdict == "IRRELEVANT":
+            feedback.append("⚠️ LLM determined code is irrelevant to the problem. Score: 0.")
+            return 0, [], "IRRELEVANT"
 
         if language == "python":
             score, missing_concepts = self._evaluate_approach_python(code, problem, feedback, llm_verdict)
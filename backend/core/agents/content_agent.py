@@ -1,9 +1,49 @@
 import re
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 import difflib
 
 from .base_agent import EvaluationAgent
-from utils.llm_service import LLMService
+from utils.llm_service import get_llm_service
+
+# Suffixes that usually mark generic verbs/adjectives rather than domain terms
+_SUFFIX_RE = re.compile(r"(?:ing|ed|ly|tion|ment|ness)$")
+# Technical terms that carry one of the suffixes above but should be kept
+_KEEP_SUFFIX = frozenset({"indexing", "embedding", "processing", "generation", "retrieval"})
+
+# Runs of text between sentence terminators
+_SENTENCE_RE = re.compile(r"[^.!?]+")
+
+# Common stopwords and generic terms to filter out of problem statements
+_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "from", "by", "as", "is", "was", "are", "were", "be",
+    "been", "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "should", "could", "may", "might", "must", "can", "this",
+    "that", "these", "those", "your", "their", "our", "its", "his", "her",
+    # Additional generic words to filter
+    "make", "create", "provide", "include", "ensure", "allow", "enable",
+    "support", "help", "need", "want", "give", "take", "show", "tell",
+    "huge", "large", "small", "good", "bad", "best", "better", "more",
+    "less", "most", "least", "very", "much", "many", "some", "all",
+    "each", "every", "both", "either", "neither", "other", "another",
+    "such", "same", "different", "new", "old", "first", "last", "next",
+    "previous", "following", "above", "below", "between", "among",
+    "expert", "hours", "challenge", "statement", "detailed", "report",
+    "proposed", "solution", "plan", "problem"
+})
+
+
+@lru_cache(maxsize=32)
+def _concepts_regex(concept_lowers: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile one alternation that finds every concept start in a single scan.
+
+    Alternatives are ordered longest first and wrapped in a lookahead so that
+    overlapping concepts are all reported. Cached because the same concept
+    list is reused for every submission in a batch.
+    """
+    alternatives = sorted({c for c in concept_lowers if c}, key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
 
 
 class ContentEvaluationAgent(EvaluationAgent):
@@ -11,7 +51,7 @@ class ContentEvaluationAgent(EvaluationAgent):
 
     def __init__(self):
         super().__init__()
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
 
     def evaluate(self, input_data: Any) -> Dict[str, Any]:
         """
@@ -37,6 +77,8 @@ class ContentEvaluationAgent(EvaluationAgent):
 
         feedback = []
         scores = {}
+        # Lowercase once; every keyword check below reuses this buffer
+        content_lower = student_content.lower()
 
         # Extract key concepts from rubric, reference, or problem statement
         key_concepts = self._extract_key_concepts(rubric, ideal_reference, problem_statement)
@@ -63,7 +105,7 @@ class ContentEvaluationAgent(EvaluationAgent):
         
         # Analyze concept coverage — returns (score, missing_concepts) tuple (thread-safe)
         coverage_score, missing_concepts = self._evaluate_concept_coverage(
-            student_content, key_concepts, feedback
+            student_content, content_lower, key_concepts, feedback
         )
 
         # Fallback Gate: If LLM is disabled or uncertain, and coverage is zero, fail
@@ -103,21 +145,21 @@ class ContentEvaluationAgent(EvaluationAgent):
 
         # Analyze alignment with requirements
         alignment_feedback = []
-        alignment_score = self._evaluate_alignment(student_content, rubric, alignment_feedback)
+        alignment_score = self._evaluate_alignment(student_content, content_lower, rubric, alignment_feedback)
         if not is_custom or "alignment" in weights:
             feedback.extend(alignment_feedback)
             scores["alignment"] = alignment_score
 
         # Analyze logical flow
         flow_feedback = []
-        flow_score = self._evaluate_logical_flow(student_content, flow_feedback)
+        flow_score = self._evaluate_logical_flow(student_content, content_lower, flow_feedback)
         if not is_custom or "flow" in weights:
             feedback.extend(flow_feedback)
             scores["flow"] = flow_score
 
         # Analyze completeness
         completeness_feedback = []
-        completeness_score = self._evaluate_completeness(student_content, completeness_feedback)
+        completeness_score = self._evaluate_completeness(student_content, content_lower, completeness_feedback)
         if not is_custom or "completeness" in weights:
             feedback.extend(completeness_feedback)
             scores["completeness"] = completeness_score
@@ -202,48 +244,24 @@ class ContentEvaluationAgent(EvaluationAgent):
         - Keeping words 4+ characters
         - Filtering generic verbs and adjectives
         """
-        # Common stopwords to filter out
-        stopwords = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-            "of", "with", "from", "by", "as", "is", "was", "are", "were", "be",
-            "been", "being", "have", "has", "had", "do", "does", "did", "will",
-            "would", "should", "could", "may", "might", "must", "can", "this",
-            "that", "these", "those", "your", "their", "our", "its", "his", "her",
-            # Additional generic words to filter
-            "make", "create", "provide", "include", "ensure", "allow", "enable",
-            "support", "help", "need", "want", "give", "take", "show", "tell",
-            "huge", "large", "small", "good", "bad", "best", "better", "more",
-            "less", "most", "least", "very", "much", "many", "some", "all",
-            "each", "every", "both", "either", "neither", "other", "another",
-            "such", "same", "different", "new", "old", "first", "last", "next",
-            "previous", "following", "above", "below", "between", "among",
-            "expert", "hours", "challenge", "statement", "detailed", "report",
-            "proposed", "solution", "plan", "problem"
-        }
-        
         # Extract words 4+ characters
         words = re.findall(r"\b\w{4,}\b", problem_statement.lower())
         
         # Filter stopwords and generic terms
-        task_concepts = [w for w in set(words) if w not in stopwords]
+        task_concepts = [w for w in set(words) if w not in _STOPWORDS]
         
-        # Prioritize technical/domain terms (words with specific patterns)
-        # Keep terms that look like technical concepts (contain numbers, capitals in original, etc.)
-        domain_terms = []
-        for concept in task_concepts:
-            # Skip if it's a common verb or adjective
-            if concept.endswith(('ing', 'ed', 'ly', 'tion', 'ment', 'ness')):
-                # Only keep if it's a technical term (e.g., "indexing", "embedding")
-                if concept in ['indexing', 'embedding', 'processing', 'generation', 'retrieval']:
-                    domain_terms.append(concept)
-            else:
-                domain_terms.append(concept)
+        # Prioritize technical/domain terms: skip common verbs and adjectives
+        # unless they are known technical terms (e.g., "indexing", "embedding")
+        domain_terms = [
+            w for w in task_concepts
+            if not _SUFFIX_RE.search(w) or w in _KEEP_SUFFIX
+        ]
         
         # Return top 12 most relevant concepts (reduced from 15 for better precision)
         return domain_terms[:12]
 
     def _evaluate_concept_coverage(
-        self, content: str, key_concepts: List[str], feedback: List[str]
+        self, content: str, content_lower: str, key_concepts: List[str], feedback: List[str]
     ) -> tuple:
         """Evaluate coverage of key concepts.
 
@@ -256,15 +274,20 @@ class ContentEvaluationAgent(EvaluationAgent):
             feedback.append("ℹ No key concepts specified for comparison.")
             return 60, []
 
-        content_lower = content.lower()
-        covered_concepts = [
-            c for c in key_concepts
-            if isinstance(c, str) and c.lower() in content_lower
-        ]
-        missing_concepts = [
-            c for c in key_concepts
-            if isinstance(c, str) and c.lower() not in content_lower
-        ]
+        concepts = [c for c in key_concepts if isinstance(c, str)]
+        concept_lowers = [c.lower() for c in concepts]
+
+        # One pass over the content collects every concept occurrence. A concept
+        # that is a prefix of a longer one at the same position is shadowed by
+        # the longer match, so it also counts as a hit when it prefixes one.
+        hit_set = set(_concepts_regex(tuple(concept_lowers)).findall(content_lower))
+
+        def is_hit(concept_lower: str) -> bool:
+            return concept_lower in hit_set or any(h.startswith(concept_lower) for h in hit_set)
+
+        hits = [is_hit(cl) for cl in concept_lowers]
+        covered_concepts = [c for c, hit in zip(concepts, hits) if hit]
+        missing_concepts = [c for c, hit in zip(concepts, hits) if not hit]
 
         coverage_percent = (len(covered_concepts) / len(key_concepts)) * 100 if key_concepts else 0
 
@@ -303,7 +326,7 @@ class ContentEvaluationAgent(EvaluationAgent):
         return min(score, 100), missing_concepts
 
     def _evaluate_alignment(
-        self, content: str, rubric: dict, feedback: List[str]
+        self, content: str, content_lower: str, rubric: dict, feedback: List[str]
     ) -> float:
         """Evaluate alignment with rubric requirements."""
         score = 50
@@ -317,7 +340,7 @@ class ContentEvaluationAgent(EvaluationAgent):
             if isinstance(objectives, list):
                 matched = sum(
                     1 for obj in objectives
-                    if isinstance(obj, str) and obj.lower() in content.lower()
+                    if isinstance(obj, str) and obj.lower() in content_lower
                 )
                 if matched > 0:
                     score += 30
@@ -333,7 +356,7 @@ class ContentEvaluationAgent(EvaluationAgent):
             if isinstance(sections, list):
                 matched_sections = sum(
                     1 for sec in sections
-                    if isinstance(sec, str) and sec.lower() in content.lower()
+                    if isinstance(sec, str) and sec.lower() in content_lower
                 )
                 if matched_sections >= len(sections) * 0.7:
                     score += 20
@@ -348,30 +371,31 @@ class ContentEvaluationAgent(EvaluationAgent):
 
         return min(score, 100)
 
-    def _evaluate_logical_flow(self, content: str, feedback: List[str]) -> float:
+    def _evaluate_logical_flow(self, content: str, content_lower: str, feedback: List[str]) -> float:
         """Evaluate logical flow and organization."""
         score = 50
 
-        lines = content.split("\n")
-        paragraphs = [p.strip() for p in lines if p.strip()]
-        sentences = re.split(r"[.!?]+", content)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        paragraph_count = sum(1 for line in content.split("\n") if line.strip())
 
         # Check paragraph structure
-        if len(paragraphs) > 3:
+        if paragraph_count > 3:
             score += 25
-            feedback.append(f"✓ Well-organized ({len(paragraphs)} distinct sections).")
-        elif len(paragraphs) > 1:
+            feedback.append(f"✓ Well-organized ({paragraph_count} distinct sections).")
+        elif paragraph_count > 1:
             score += 15
             feedback.append("→ Consider organizing content into more distinct sections.")
         else:
             feedback.append("→ Break content into multiple paragraphs for clarity.")
 
-        # Check sentence complexity and variety
-        avg_sentence_length = (
-            sum(len(s.split()) for s in sentences) / len(sentences)
-            if sentences else 0
-        )
+        # Check sentence complexity and variety (single pass, no sentence list)
+        sentence_count = 0
+        total_words = 0
+        for match in _SENTENCE_RE.finditer(content):
+            words = len(match.group().split())
+            if words:
+                sentence_count += 1
+                total_words += words
+        avg_sentence_length = total_words / sentence_count if sentence_count else 0
 
         if 10 < avg_sentence_length < 25:
             score += 15
@@ -392,7 +416,7 @@ class ContentEvaluationAgent(EvaluationAgent):
             "in contrast", "meanwhile", "next", "finally"
         ]
         transitions = sum(
-            1 for word in transition_words if word in content.lower()
+            1 for word in transition_words if word in content_lower
         )
 
         if transitions >= 3:
@@ -403,12 +427,10 @@ class ContentEvaluationAgent(EvaluationAgent):
 
         return min(score, 100)
 
-    def _evaluate_completeness(self, content: str, feedback: List[str]) -> float:
+    def _evaluate_completeness(self, content: str, content_lower: str, feedback: List[str]) -> float:
         """Evaluate content completeness and detail."""
         score = 50
 
-        lines = content.split("\n")
-        non_empty_lines = [l for l in lines if l.strip()]
         word_count = len(content.split())
 
         # Check content length
@@ -429,7 +451,7 @@ class ContentEvaluationAgent(EvaluationAgent):
             "in particular", "illustration", "case study"
         ]
         has_examples = any(
-            indicator in content.lower() for indicator in example_indicators
+            indicator in content_lower for indicator in example_indicators
         )
 
         if has_examples:
@@ -444,7 +466,7 @@ class ContentEvaluationAgent(EvaluationAgent):
             "proven", "demonstrated", "support", "justify"
         ]
         has_reasoning = any(
-            indicator in content.lower() for indicator in reasoning_indicators
+            indicator in content_lower for indicator in reasoning_indicators
         )
 
         if has_reasoning:
@@ -93,6 +93,7 @@ class Orchestrator:
             Results mapped to student names
         """
         results = {}
+        verdicts = self._code_relevance(submissions, problem_statement)
 
         def process_submission(filename, code):
             student_name = get_student_name_from_filename(filename)
@@ -105,6 +106,7 @@ class Orchestrator:
                 "rubric": {"weights": code_weights},
                 "student_code": code,
                 "filename": filename,  # Add filename for language detection
+                "relevance_verdict": verdicts.get(filename),
             }
 
             # Evaluate with code agent
@@ -224,43 +226,49 @@ class Orchestrator:
         code_submissions = submissions.get("code", {})
         content_submissions = submissions.get("text", {})
 
-        all_students = set(
-            get_student_name_from_filename(f)
-            for f in list(code_submissions.keys()) + list(content_submissions.keys())
-        )
+        # Index each student's first code and content file once, instead of
+        # rescanning every filename for every student
+        code_by_student = {}
+        for filename, code in code_submissions.items():
+            code_by_student.setdefault(get_student_name_from_filename(filename), (filename, code))
+        content_by_student = {}
+        for filename, content in content_submissions.items():
+            content_by_student.setdefault(get_student_name_from_filename(filename), content)
+
+        all_students = code_by_student.keys() | content_by_student.keys()
+        verdicts = self._code_relevance(dict(code_by_student.values()), problem_statement)
 
         def process_mixed(student_name):
             agent_outputs = []
 
             # Evaluate code if available
-            for filename, code in code_submissions.items():
-                if get_student_name_from_filename(filename) == student_name:
-                    code_criteria = self.rubric.get_criteria("code")
-                    code_weights = {k: v.get("weight", 0.25) for k, v in code_criteria.items()}
-                    agent_input = {
-                        "problem_statement": problem_statement or "",
-                        "rubric": {"weights": code_weights},
-                        "student_code": code,
-                        "filename": filename,  # Add filename for language detection
-                    }
-                    code_output = self.code_agent.evaluate(agent_input)
-                    agent_outputs.append(code_output)
-                    break
+            if student_name in code_by_student:
+                filename, code = code_by_student[student_name]
+                code_criteria = self.rubric.get_criteria("code")
+                code_weights = {k: v.get("weight", 0.25) for k, v in code_criteria.items()}
+                agent_input = {
+                    "problem_statement": problem_statement or "",
+                    "rubric": {"weights": code_weights},
+                    "student_code": code,
+                    "filename": filename,  # Add filename for language detection
+                    "relevance_verdict": verdicts.get(filename),
+                }
+                code_output = self.code_agent.evaluate(agent_input)
+                agent_outputs.append(code_output)
 
             # Evaluate content if available
-            for filename, content in content_submissions.items():
-                if get_student_name_from_filename(filename) == student_name:
-                    content_criteria = self.rubric.get_criteria("content")
-                    content_weights = {k: v.get("weight", 0.25) for k, v in content_criteria.items()}
-                    agent_input = {
-                        "student_content": content,
-                        "rubric": {"weights": content_weights},
-                        "ideal_reference": ideal_reference or "",
-                        "problem_statement": problem_statement or "",  # NEW: for auto-extraction
-                    }
-                    content_output = self.content_agent.evaluate(agent_input)
-                    agent_outputs.append(content_output)
-                    break
+            if student_name in content_by_student:
+                content = content_by_student[student_name]
+                content_criteria = self.rubric.get_criteria("content")
+                content_weights = {k: v.get("weight", 0.25) for k, v in content_criteria.items()}
+                agent_input = {
+                    "student_content": content,
+                    "rubric": {"weights": content_weights},
+                    "ideal_reference": ideal_reference or "",
+                    "problem_statement": problem_statement or "",  # NEW: for auto-extraction
+                }
+                content_output = self.content_agent.evaluate(agent_input)
+                agent_outputs.append(content_output)
 
             # Aggregate results
             if agent_outputs:
@@ -293,6 +301,35 @@ class Orchestrator:
 
         return results
 
+    def _code_relevance(
+        self,
+        submissions: Dict[str, str],
+        problem_statement: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Check every code submission's relevance up front, several per LLM request.
+
+        Args:
+            submissions: Dict of filename to code content
+            problem_statement: Problem description
+
+        Returns:
+            Filename to verdict. Empty if the LLM is disabled or the bulk check
+            failed; the code agent then checks each submission itself.
+        """
+        llm_service = self.code_agent.llm_service
+        if not submissions or not llm_service.enabled:
+            return {}
+        filenames = list(submissions)
+        try:
+            verdicts = llm_service.check_relevance_bulk(
+                problem_statement or "", [submissions[f] for f in filenames], "code"
+            )
+        except Exception as e:
+            print(f"Bulk relevance check failed: {e}")
+            return {}
+        return dict(zip(filenames, verdicts))
+
     def get_rubric(self) -> Rubric:
         """
         Get the rubric used by this orchestrator.
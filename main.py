@@ -3,10 +3,23 @@ Main entry point for evaluation orchestrator.
 Demonstrates a complete workflow: load rubric, read submissions, evaluate, report results.
 """
 
+from pathlib import Path
+
 from controller.orchestrator import Orchestrator
 from utils.rubric import Rubric
 from utils.csv_export import export_results_to_csv, export_results_to_detailed_csv
 
+PROBLEM_STATEMENT_PATH = Path("./sample_data/problem.txt")
+
+IDEAL_REFERENCE = """
+    A good solution demonstrates:
+    1. Clear problem understanding: identifies even numbers
+    2. Proper error handling: handles empty or invalid inputs
+    3. Efficient iteration: uses appropriate loops
+    4. Clean code: meaningful variable names and comments
+    5. Testing: shows awareness of test cases
+    """
+
 
 def main():
     """Run a complete evaluation workflow."""
@@ -37,17 +50,7 @@ def main():
     SUBMISSIONS_FOLDER = "./sample_data/submissions"  # Update with actual folder path
     
     # Read problem statement
-    with open("./sample_data/problem.txt", "r") as f:
-        PROBLEM_STATEMENT = f.read()
-    
-    IDEAL_REFERENCE = """
-    A good solution demonstrates:
-    1. Clear problem understanding: identifies even numbers
-    2. Proper error handling: handles empty or invalid inputs
-    3. Efficient iteration: uses appropriate loops
-    4. Clean code: meaningful variable names and comments
-    5. Testing: shows awareness of test cases
-    """
+    PROBLEM_STATEMENT = PROBLEM_STATEMENT_PATH.read_text(encoding="utf-8")
 
     print(f"[2] Configuration:")
     print(f"    - Assignment Type: {ASSIGNMENT_TYPE}")
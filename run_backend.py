@@ -14,11 +14,23 @@ try:
     print(f"Pydantic version: {pydantic.VERSION}")
     
     import uvicorn
-    from backend.app.main import app
     
     # Run Server
-    print("Launching Uvicorn on 8000...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # loop/http "auto" select uvloop and httptools when installed (uvloop is not
+    # available on Windows). The app is passed as an import string, so it is
+    # only loaded in the process(es) that serve it. Each extra worker sends
+    # its own LLM warm-up request and keeps its own caches.
+    workers = int(os.getenv("WORKERS", "1"))
+    print(f"Launching Uvicorn on 8000 with {workers} worker(s)...")
+    uvicorn.run(
+        "backend.app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        log_level="info",
+    )
     
 except BaseException:
     print("CRITICAL FAILURE")
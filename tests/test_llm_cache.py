@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+from utils import llm_cache
+from utils.llm_cache import LLMCache
+
+
+class LLMCacheTest(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = LLMCache(maxsize=4, ttl=60)
+        key = LLMCache.key_for("model", "prompt")
+        self.assertIsNone(cache.get(key))
+        cache.set(key, "answer")
+        self.assertEqual(cache.get(key), "answer")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_key_depends_on_model(self):
+        self.assertNotEqual(LLMCache.key_for("a", "prompt"), LLMCache.key_for("b", "prompt"))
+
+    def test_evicts_least_recently_used(self):
+        cache = LLMCache(maxsize=2, ttl=60)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_entries_expire(self):
+        now = [1000.0]
+        with mock.patch.object(llm_cache.time, "monotonic", lambda: now[0]):
+            cache = LLMCache(maxsize=4, ttl=10)
+            cache.set("default", "1")
+            cache.set("short", "2", ttl=1)
+            now[0] += 5
+            self.assertEqual(cache.get("default"), "1")
+            self.assertIsNone(cache.get("short"))
+            now[0] += 10
+            self.assertIsNone(cache.get("default"))
+            self.assertEqual(cache.stats()["size"], 0)
+
+    def test_get_any_returns_first_cached_key(self):
+        cache = LLMCache(maxsize=4, ttl=60)
+        cache.set("second", "2")
+        cache.set("third", "3")
+        self.assertEqual(cache.get_any(["first", "second", "third"]), "2")
+        # Several keys count as one lookup
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+try:
+    import google.generativeai  # noqa: F401
+except ImportError:
+    # Only the names used at import time; the tests never reach the SDK
+    google = types.ModuleType("google")
+    google.__path__ = []
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = None
+    google.generativeai = genai
+    sys.modules.setdefault("google", google)
+    sys.modules.setdefault("google.generativeai", genai)
+
+from utils import llm_service
+from utils.llm_service import LLMService
+
+PROBLEM = "Write a function that returns the sum of a list of integers."
+SUBMISSIONS = [
+    "def total(values):\n    return sum(values)",
+    "def total(values):\n    result = 0\n    for v in values:\n        result += v\n    return result",
+    "def reverse(text):\n    return text[::-1]",
+]
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Answers bulk prompts with `bulk` and single prompts with `single`."""
+
+    def __init__(self, bulk, single="Verdict: RELEVANT"):
+        self.bulk = bulk
+        self.single = single
+        self.bulk_calls = 0
+        self.single_calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        if "Submission 1:" in prompt:
+            self.bulk_calls += 1
+            return self.bulk(prompt)
+        self.single_calls += 1
+        return FakeResponse(self.single)
+
+
+def bulk_json(*verdicts):
+    return FakeResponse(json.dumps([
+        {"id": i, "reasoning": "", "verdict": verdict}
+        for i, verdict in enumerate(verdicts, 1)
+    ]))
+
+
+class CheckRelevanceBulkTest(unittest.TestCase):
+    def setUp(self):
+        for cache in (llm_service._RELEVANCE_CACHE, llm_service._LLM_CACHE._entries, llm_service._MODEL_FAILURES):
+            cache.clear()
+        env = mock.patch.dict(os.environ, {"LLM_ENABLED": "true", "GEMINI_API_KEY": "test"})
+        env.start()
+        self.addCleanup(env.stop)
+        sleep = mock.patch.object(llm_service.time, "sleep", lambda seconds: None)
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def make_service(self, model):
+        service = LLMService()
+        service.semantic_cache = None
+        service._setup_done = True
+        service._client = model
+        service._get_model = lambda name: model
+        return service
+
+    def test_maps_verdicts_by_id(self):
+        # Entries out of order: verdicts follow the ids, not the positions
+        model = FakeModel(lambda prompt: FakeResponse(json.dumps([
+            {"id": 3, "verdict": "irrelevant"},
+            {"id": 1, "verdict": "RELEVANT"},
+            {"id": 2, "verdict": "PARTIAL"},
+        ])))
+        service = self.make_service(model)
+
+        self.assertEqual(
+            service.check_relevance_bulk(PROBLEM, SUBMISSIONS),
+            ["RELEVANT", "PARTIAL", "IRRELEVANT"],
+        )
+        self.assertEqual((model.bulk_calls, model.single_calls), (1, 0))
+        # Shared with check_relevance
+        self.assertEqual(service.check_relevance(PROBLEM, SUBMISSIONS[1]), "PARTIAL")
+        self.assertEqual(model.single_calls, 0)
+
+    def test_trivial_submissions_are_not_sent(self):
+        model = FakeModel(lambda prompt: bulk_json("RELEVANT"))
+        service = self.make_service(model)
+
+        self.assertEqual(
+            service.check_relevance_bulk(PROBLEM, ["", PROBLEM, SUBMISSIONS[0]]),
+            ["IRRELEVANT", "IRRELEVANT", "RELEVANT"],
+        )
+        self.assertEqual(model.bulk_calls, 1)
+
+    def test_missing_id_falls_back_to_single_check(self):
+        model = FakeModel(lambda prompt: bulk_json("RELEVANT", "UNKNOWN"), single="Verdict: PARTIAL")
+        service = self.make_service(model)
+
+        self.assertEqual(
+            service.check_relevance_bulk(PROBLEM, SUBMISSIONS),
+            ["RELEVANT", "PARTIAL", "PARTIAL"],
+        )
+        self.assertEqual((model.bulk_calls, model.single_calls), (1, 2))
+
+    def test_unparseable_response_falls_back_to_single_checks(self):
+        model = FakeModel(lambda prompt: FakeResponse("Submission 1 looks fine."))
+        service = self.make_service(model)
+
+        self.assertEqual(service.check_relevance_bulk(PROBLEM, SUBMISSIONS), ["RELEVANT"] * 3)
+        self.assertEqual((model.bulk_calls, model.single_calls), (1, 3))
+
+    def test_rate_limited_group_is_uncertain_and_not_cached(self):
+        def rate_limited(prompt):
+            raise Exception("429 Resource has been exhausted")
+
+        model = FakeModel(rate_limited)
+        service = self.make_service(model)
+
+        self.assertEqual(service.check_relevance_bulk(PROBLEM, SUBMISSIONS), ["UNCERTAIN"] * 3)
+        # Retried with backoff, but never fanned out into one request each
+        self.assertEqual((model.bulk_calls, model.single_calls), (3, 0))
+        self.assertEqual(len(llm_service._RELEVANCE_CACHE), 0)
+
+    def test_large_input_is_split_into_groups(self):
+        submissions = [f"def total(values):\n    return sum(values)  # {i}" for i in range(10)]
+        model = FakeModel(lambda prompt: bulk_json(*["RELEVANT"] * prompt.count("Submission ")))
+        service = self.make_service(model)
+
+        self.assertEqual(service.check_relevance_bulk(PROBLEM, submissions), ["RELEVANT"] * 10)
+        self.assertEqual(model.bulk_calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from utils.semantic_cache import SemanticCache
+
+
+class FakeTokenizer:
+    def __call__(self, text, truncation=False):
+        return {"input_ids": text.split()}
+
+
+class FakeEncoder:
+    """Stands in for a SentenceTransformer: fixed vectors per text."""
+
+    tokenizer = FakeTokenizer()
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True):
+        self.calls.append(list(texts))
+        rows = np.array([self.vectors[text] for text in texts], dtype=np.float32)
+        return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+VECTORS = {
+    "sum of a list": [1.0, 0.0, 0.0],
+    "sum of the list": [0.98, 0.2, 0.0],
+    "reverse a string": [0.0, 1.0, 0.0],
+}
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class SemanticCacheTest(unittest.TestCase):
+    def make_cache(self, persist_dir=None, threshold=0.95):
+        cache = SemanticCache(threshold=threshold, persist_dir=persist_dir)
+        cache._model = FakeEncoder(VECTORS)
+        return cache
+
+    def test_lookup_returns_similar_entry(self):
+        cache = self.make_cache()
+        namespace = SemanticCache.namespace_for("problem")
+        cache.insert(namespace, cache.embed("sum of a list"), ["feedback"])
+        self.assertEqual(cache.lookup(namespace, cache.embed("sum of the list")), ["feedback"])
+        self.assertIsNone(cache.lookup(namespace, cache.embed("reverse a string")))
+
+    def test_threshold(self):
+        cache = self.make_cache()
+        namespace = SemanticCache.namespace_for("problem")
+        cache.insert(namespace, cache.embed("sum of a list"), "RELEVANT")
+        similar = cache.embed("sum of the list")
+        self.assertIsNone(cache.lookup(namespace, similar, threshold=0.999))
+        self.assertEqual(cache.lookup(namespace, similar, threshold=0.9), "RELEVANT")
+
+    def test_namespaces_are_separate(self):
+        cache = self.make_cache()
+        embedding = cache.embed("sum of a list")
+        cache.insert(SemanticCache.namespace_for("problem 1"), embedding, "RELEVANT")
+        self.assertIsNone(cache.lookup(SemanticCache.namespace_for("problem 2"), embedding))
+
+    def test_buffer_grows(self):
+        cache = self.make_cache()
+        namespace = SemanticCache.namespace_for("problem")
+        for i in range(40):
+            cache.insert(namespace, cache.embed("reverse a string"), i)
+        cache.insert(namespace, cache.embed("sum of a list"), "last")
+        self.assertEqual(cache.lookup(namespace, cache.embed("sum of a list")), "last")
+
+    def test_prime_embeds_in_one_batch(self):
+        cache = self.make_cache()
+        cache.prime(["sum of a list", "reverse a string", "sum of a list"])
+        cache.embed("sum of a list")
+        cache.embed("reverse a string")
+        self.assertEqual(cache._model.calls, [["sum of a list", "reverse a string"]])
+
+    def test_long_text_is_not_embedded(self):
+        cache = self.make_cache()
+        self.assertIsNone(cache.embed("word " * 300))
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            namespace = SemanticCache.namespace_for("problem")
+            cache = self.make_cache(persist_dir)
+            cache.insert(namespace, cache.embed("sum of a list"), ["feedback"])
+            cache.flush()
+
+            reloaded = self.make_cache(persist_dir)
+            self.assertEqual(reloaded.lookup(namespace, reloaded.embed("sum of the list")), ["feedback"])
+
+    def test_rejects_inconsistent_files(self):
+        with tempfile.TemporaryDirectory() as persist_dir:
+            namespace = SemanticCache.namespace_for("problem")
+            cache = self.make_cache(persist_dir)
+            cache.insert(namespace, cache.embed("sum of a list"), "RELEVANT")
+            cache.flush()
+            # Responses file from another write, one row short
+            with open(os.path.join(persist_dir, f"{namespace}.json"), "w", encoding="utf-8") as f:
+                json.dump([], f)
+
+            reloaded = self.make_cache(persist_dir)
+            self.assertIsNone(reloaded.lookup(namespace, reloaded.embed("sum of a list")))
+            # The namespace starts over and accepts new entries
+            reloaded.insert(namespace, reloaded.embed("reverse a string"), "PARTIAL")
+            self.assertEqual(reloaded.lookup(namespace, reloaded.embed("reverse a string")), "PARTIAL")
+
+
+if __name__ == "__main__":
+    unittest.main()
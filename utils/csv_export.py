@@ -1,12 +1,25 @@
 import csv
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Column order shared by both exporters
+FIELDNAMES = ("submission_id", "final_score", "max_score", "feedback", "assignment_type", "file")
+
+# 1 MiB write buffer: fewer write syscalls for large exports
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Characters that force a field to be quoted (csv "excel" dialect, QUOTE_MINIMAL)
+_CSV_SPECIAL_CHARS = (",", '"', "\r", "\n")
+
+# Feedback column for submissions without any feedback (detailed export)
+_NO_FEEDBACK = ("No feedback available",)
 
 
 def export_results_to_csv(
     results: Dict[str, Dict[str, Any]],
     output_folder: str = "./outputs",
     filename: Optional[str] = None,
+    safe_mode: bool = False,
 ) -> str:
     """
     Export evaluation results to CSV file.
@@ -15,6 +28,7 @@ def export_results_to_csv(
         results: Dictionary of student name to evaluation results
         output_folder: Folder to save CSV file
         filename: CSV filename. If None, uses 'results.csv'
+        safe_mode: Write through the csv module instead of the str.join fast path
 
     Returns:
         Path to the created CSV file
@@ -28,32 +42,27 @@ def export_results_to_csv(
     if not results:
         raise ValueError("No results to export")
 
-    # Prepare rows
-    rows = []
-    for student_name, evaluation in results.items():
-        row = {
-            "submission_id": student_name,
-            "final_score": evaluation.get("final_score", "N/A"),
-            "max_score": evaluation.get("max_score", 100),
-            "feedback": _format_feedback_for_csv(
-                evaluation.get("combined_feedback", [])
-            ),
-            "assignment_type": evaluation.get("assignment_type", "N/A"),
-            "file": evaluation.get("file", "N/A"),
-        }
-        rows.append(row)
-
-    # Write to CSV
-    fieldnames = ["submission_id", "final_score", "max_score", "feedback", "assignment_type", "file"]
-
-    with open(csv_file_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    with open(
+        csv_file_path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+    ) as csvfile:
+        _write_rows(csvfile, _summary_rows(results), safe_mode)
 
     return str(csv_file_path)
 
 
+def _summary_rows(results: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """Yield one row per submission, in FIELDNAMES order."""
+    for student_name, evaluation in results.items():
+        yield (
+            student_name,
+            evaluation.get("final_score", "N/A"),
+            evaluation.get("max_score", 100),
+            _format_feedback_for_csv(evaluation.get("combined_feedback", [])),
+            evaluation.get("assignment_type", "N/A"),
+            evaluation.get("file", "N/A"),
+        )
+
+
 def _format_feedback_for_csv(feedback_list: List[str]) -> str:
     """
     Format feedback list into a single CSV-safe string.
@@ -75,6 +84,7 @@ def export_results_to_detailed_csv(
     results: Dict[str, Dict[str, Any]],
     output_folder: str = "./outputs",
     filename: Optional[str] = None,
+    safe_mode: bool = False,
 ) -> str:
     """
     Export evaluation results to a detailed CSV with separate columns per feedback item.
@@ -83,6 +93,7 @@ def export_results_to_detailed_csv(
         results: Dictionary of student name to evaluation results
         output_folder: Folder to save CSV file
         filename: CSV filename. If None, uses 'results_detailed.csv'
+        safe_mode: Write through the csv module instead of the str.join fast path
 
     Returns:
         Path to the created CSV file
@@ -96,39 +107,64 @@ def export_results_to_detailed_csv(
     if not results:
         raise ValueError("No results to export")
 
-    # Prepare rows (one feedback per row)
-    rows = []
+    with open(
+        csv_file_path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+    ) as csvfile:
+        _write_rows(csvfile, _detailed_rows(results), safe_mode)
+
+    return str(csv_file_path)
+
+
+def _detailed_rows(results: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yield one row per feedback item, in FIELDNAMES order.
+
+    Per-student columns are looked up once; only the feedback column changes
+    between rows.
+    """
     for student_name, evaluation in results.items():
-        feedback_list = evaluation.get("combined_feedback", [])
-
-        if feedback_list:
-            for feedback_item in feedback_list:
-                row = {
-                    "submission_id": student_name,
-                    "final_score": evaluation.get("final_score", "N/A"),
-                    "max_score": evaluation.get("max_score", 100),
-                    "feedback": feedback_item,
-                    "assignment_type": evaluation.get("assignment_type", "N/A"),
-                    "file": evaluation.get("file", "N/A"),
-                }
-                rows.append(row)
-        else:
-            row = {
-                "submission_id": student_name,
-                "final_score": evaluation.get("final_score", "N/A"),
-                "max_score": evaluation.get("max_score", 100),
-                "feedback": "No feedback available",
-                "assignment_type": evaluation.get("assignment_type", "N/A"),
-                "file": evaluation.get("file", "N/A"),
-            }
-            rows.append(row)
-
-    # Write to CSV
-    fieldnames = ["submission_id", "final_score", "max_score", "feedback", "assignment_type", "file"]
-
-    with open(csv_file_path, "w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+        feedback_list = evaluation.get("combined_feedback") or _NO_FEEDBACK
+        final_score = evaluation.get("final_score", "N/A")
+        max_score = evaluation.get("max_score", 100)
+        assignment_type = evaluation.get("assignment_type", "N/A")
+        file = evaluation.get("file", "N/A")
+
+        for feedback_item in feedback_list:
+            yield (
+                student_name, final_score, max_score,
+                feedback_item, assignment_type, file,
+            )
+
+
+def _write_rows(csvfile: TextIO, rows: Iterable[Tuple[Any, ...]], safe_mode: bool) -> None:
+    """
+    Write the header and rows as they are produced.
+
+    The default path formats each line with str.join and only quotes fields
+    that need it; its output matches csv.writer. safe_mode uses csv.writer.
+    """
+    if safe_mode:
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
         writer.writerows(rows)
+        return
 
-    return str(csv_file_path)
+    write = csvfile.write
+    write(_csv_line(FIELDNAMES))
+    for row in rows:
+        write(_csv_line(row))
+
+
+def _csv_line(values: Tuple[Any, ...]) -> str:
+    """Format one CSV record, terminated like the csv module's default dialect."""
+    return ",".join(_csv_escape(v) for v in values) + "\r\n"
+
+
+def _csv_escape(value: Any) -> str:
+    """Convert a value to a CSV field, quoting only when required."""
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if any(c in text for c in _CSV_SPECIAL_CHARS):
+        return '"' + text.replace('"', '""') + '"'
+    return text
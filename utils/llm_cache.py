@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class LLMCache:
+    """
+    Exact-match cache of LLM response texts.
+
+    Keys are SHA-256 digests of (model, prompt), so identical prompts sent to
+    the same model are answered from memory. Entries are evicted least
+    recently used first and expire after their TTL.
+
+    If a Redis URL is given, entries are also written to Redis so they are
+    shared between worker processes. The redis package is imported lazily;
+    if it is missing or the server is unreachable the cache stays in-memory.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600, redis_url: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url)
+                self._redis.ping()
+            except Exception as e:
+                print(f"WARNING: Redis LLM cache unavailable: {e}. Using in-memory cache only.")
+                self._redis = None
+
+    @staticmethod
+    def key_for(model: str, prompt: str) -> str:
+        """Build the cache key for a prompt sent to a model."""
+        payload = json.dumps({"m": model, "p": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from key_for()
+
+        Returns:
+            Cached response text, or None on a miss.
+        """
+        return self.get_any((key,))
+
+    def get_any(self, keys: Iterable[str]) -> Optional[str]:
+        """
+        Look up the first cached response among several keys.
+
+        Used when any of a list of fallback models may have answered the
+        prompt; counts as a single hit or miss.
+
+        Args:
+            keys: Keys from key_for(), in order of preference
+
+        Returns:
+            Cached response text, or None if no key is cached.
+        """
+        keys = tuple(keys)
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        for key in keys:
+            value = self._redis_get(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._put(key, value, self.ttl, now)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Key from key_for()
+            value: Response text
+            ttl: Lifetime in seconds; defaults to the cache TTL
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._put(key, value, ttl, time.monotonic())
+        if self._redis is not None:
+            try:
+                self._redis.set(f"llm:{key}", value, ex=max(1, int(ttl)))
+            except Exception as e:
+                print(f"WARNING: Failed to write LLM cache entry to Redis: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def _put(self, key: str, value: str, ttl: float, now: float) -> None:
+        """Insert under the lock, evicting the least recently used entries."""
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Optional[str]:
+        if self._redis is None:
+            return None
+        try:
+            value = self._redis.get(f"llm:{key}")
+        except Exception as e:
+            print(f"WARNING: Failed to read LLM cache entry from Redis: {e}")
+            return None
+        return value.decode("utf-8") if value is not None else None
@@ -1,15 +1,309 @@
 import os
+import re
 import json
 import time
+import asyncio
+import concurrent.futures
+import difflib
+import functools
+import datetime
 import threading
 import google.generativeai as genai
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 from cachetools import cached, TTLCache
+from cachetools.keys import hashkey
+
+from utils.llm_cache import LLMCache
+from utils.semantic_cache import SemanticCache
+
+# orjson parses faster when installed; its errors subclass json.JSONDecodeError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Load environment variables
 load_dotenv()
 
+# Near-duplicate cache shared by all LLMService instances (agents are rebuilt per request)
+_SEMANTIC_CACHE = (
+    SemanticCache(
+        threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        persist_dir=os.getenv("LLM_SEMANTIC_CACHE_DIR"),
+        onnx_path=os.getenv("LLM_SEMANTIC_CACHE_ONNX_PATH"),
+    )
+    if os.getenv("LLM_SEMANTIC_CACHE", "false").lower() == "true"
+    else None
+)
+# A verdict decides whether a submission is graded at all, so relevance
+# checks only reuse answers for very close matches
+_RELEVANCE_SEMANTIC_THRESHOLD = float(os.getenv("LLM_SEMANTIC_CACHE_RELEVANCE_THRESHOLD", "0.95"))
+
+# Exact (model, prompt) response cache shared by all LLMService instances
+_LLM_CACHE = LLMCache(
+    maxsize=int(os.getenv("LLM_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "3600")),
+    redis_url=os.getenv("LLM_CACHE_REDIS_URL"),
+)
+
+# Response caches (24 hours), shared by the sync and async entrypoints
+_FEEDBACK_CACHE = TTLCache(maxsize=1000, ttl=86400)
+_RELEVANCE_CACHE = TTLCache(maxsize=2000, ttl=86400)
+
+# "Verdict: X" labels in a relevance response; when several appear, the
+# first one in _VERDICT_PRIORITY wins
+_VERDICT_RE = re.compile(r"VERDICT\s*:\s*(RELEVANT|PARTIAL|IRRELEVANT|UNCERTAIN)", re.IGNORECASE)
+_VERDICT_PRIORITY = ("RELEVANT", "PARTIAL", "IRRELEVANT", "UNCERTAIN")
+# Bare verdict words for responses without a "Verdict:" label
+_VERDICT_WORD_RE = re.compile(r"IRRELEVANT|PARTIAL|RELEVANT", re.IGNORECASE)
+
+# Gemini JSON mode: responses are raw JSON, no markdown fences or prose
+_JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+_RELEVANCE_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "object",
+        "properties": {
+            "reasoning": {"type": "string"},
+            "verdict": {"type": "string", "enum": list(_VERDICT_PRIORITY)},
+        },
+        "required": ["reasoning", "verdict"],
+    },
+}
+
+# Prompt budgets in estimated tokens (~4 UTF-8 bytes per token)
+_BYTES_PER_TOKEN = 4
+_PROBLEM_TOKENS = 250
+_SUBMISSION_TOKENS = 1000
+_RELEVANCE_PROBLEM_TOKENS = 375
+_RELEVANCE_SUBMISSION_TOKENS = 750
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim text to an estimated token budget.
+
+    Tokens are estimated from the UTF-8 size, so ASCII code keeps about
+    4 characters per token and multibyte text is cut by what it costs.
+    """
+    limit = max_tokens * _BYTES_PER_TOKEN
+    if len(text) * 4 <= limit:  # at most 4 bytes per character
+        return text
+    if len(text) > limit:
+        # Every character is at least one byte, so only the first `limit`
+        # characters can survive; don't encode the rest of a huge submission
+        data = text[:limit].encode("utf-8")
+    else:
+        data = text.encode("utf-8")
+        if len(data) <= limit:
+            return text
+    return data[:limit].decode("utf-8", errors="ignore")
+
+
+def _feedback_lines(text: str) -> List[str]:
+    """Split a feedback response into its non-blank, stripped lines (one pass)."""
+    return [stripped for line in text.split("\n") if (stripped := line.strip())] or [text.strip()]
+
+
+# Text submissions shorter than this (after stripping) cannot attempt the
+# problem. Code has no minimum: a one-line answer can be correct.
+_MIN_CONTENT_CHARS = 20
+# Similarity above which a submission is treated as a copy of the problem statement
+_COPY_RATIO = 0.95
+
+
+def _trivial_verdict(problem_statement: str, submission_content: str, context_type: str) -> Optional[str]:
+    """
+    Verdict for submissions that need no LLM call, or None.
+
+    Empty code, near-empty text and copies of the problem statement are
+    IRRELEVANT. The cheap upper bounds on the similarity ratio rule out
+    most submissions before the full comparison runs.
+    """
+    stripped = submission_content.strip()
+    if not stripped or (context_type != "code" and len(stripped) < _MIN_CONTENT_CHARS):
+        return "IRRELEVANT"
+    matcher = difflib.SequenceMatcher(None, submission_content, problem_statement)
+    if (
+        matcher.real_quick_ratio() > _COPY_RATIO
+        and matcher.quick_ratio() > _COPY_RATIO
+        and matcher.ratio() > _COPY_RATIO
+    ):
+        return "IRRELEVANT"
+    return None
+
+# Evaluation rules shared by the single and bulk relevance prompts
+_RELEVANCE_RULES = """CRITICAL EVALUATION RULES:
+1. **Identify the Core Logic Requirement**: What is the unique algorithmic or conceptual task? (e.g., "Implement a Trie", "Calculate GCD", "Summarize Photosynthesis").
+2. **Identify the Submission's Actual Logic**: What does this code/text actually do?
+3. **Ignore Superficial Similarities**: DO NOT be fooled by:
+    - Common programming terms (`int`, `vector`, `List`, `return`).
+    - Standard boilerplate templates.
+    - Matching words that are used in a different context.
+4. **Verdicts**:
+    - **IRRELEVANT**: If the submission is for a different problem, is just boilerplate, or contains no logic related to the core task.
+    - **PARTIAL**: If the submission shows some understanding of the problem domain but is incomplete, significantly off-track, or only addresses a small part.
+    - **RELEVANT**: If the submission shows a clear attempt to solve the specific problem, even if it has bugs or is unfinished.
+    - **UNCERTAIN**: Only if you genuinely cannot determine relevance from the provided information.
+
+"""
+
+# Submissions judged per bulk relevance request
+_BULK_RELEVANCE_SIZE = 8
+_BULK_RELEVANCE_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "reasoning": {"type": "string"},
+                "verdict": {"type": "string", "enum": list(_VERDICT_PRIORITY)},
+            },
+            "required": ["id", "reasoning", "verdict"],
+        },
+    },
+}
+
+# Static parts of the feedback prompt built by LLMService._build_prompt
+_FEEDBACK_PROMPT_HEAD = """
+You are a helpful Teaching Assistant explaining evaluation results.
+Your goal is to explain the following evaluation results and findings to a student.
+DO NOT assign a score. The score has already been determined by the system.
+DO NOT change weights or grading criteria.
+DO NOT invent new criteria. Focus ONLY on the provided context.
+Only explain based on provided facts and findings.
+
+"""
+
+_FEEDBACK_PROMPT_TAIL = """
+
+2. Explain logically WHY the given findings lead to the evaluation result.
+3. If 'Missing Concepts' are provided, gently suggest they consider those domain terms if they apply, but DO NOT artificially force them into sentences.
+4. Keep feedback encouraging but technical.
+5. Start directly with the output content (no "Here is...").
+6. Do NOT use markdown headers like "##". Use bold keys exactly as provided (e.g., "**Summary**:").
+
+"""
+
+
+# Feedback instructions by relevance verdict; any other verdict gets the default
+_IRRELEVANT_INSTRUCTIONS = """
+1. Format your response into these exact sections:
+    **Summary**: State clearly that the submission is irrelevant to the assigned problem. Briefly mention what their code/text actually does (as context).
+    
+    **Corrections Needed**: 
+    - DO NOT critique the student's code for style, comments, or naming. It is irrelevant.
+    - INSTEAD, provide a comprehensive "How to Solve the Assigned Problem" guide.
+    - Include high-level Pseudo-code and logical steps for the ACTUAL assigned task.
+    - Be a mentor: help them understand the problem they missed.
+    
+    **Strengths**: Mention 1 minor technical strength of their code (syntax/structure) ONLY if it exists, otherwise omit this section.
+"""
+
+_DEFAULT_INSTRUCTIONS = """
+1. Format your response into these exact sections:
+    **Summary**: [Brief 1-sentence explanation of what the code/content is trying to do]
+    
+    **Corrections Needed**: [A detailed paragraph explaining conceptual gaps. Behave like a patient mentor. Give precise examples of how they should improve their underlying logic.]
+    
+    **Strengths**: [1-3 concise lines highlighting what was done well]
+
+CRITICAL AI RULE: If the "Automated Findings" do not explicitly complain about a lack of comments or documentation, you MUST NEVER mention comments, documentation, styling, or variable naming anywhere in your feedback. Focus 100% on algorithm flow, mathematical constraints, and data-structures!
+"""
+
+_RELEVANCE_INSTRUCTIONS = {"IRRELEVANT": _IRRELEVANT_INSTRUCTIONS}
+
+
+@functools.lru_cache(maxsize=64)
+def _feedback_prompt_prefix(context_type: str, rubric: str, relevance_status: str) -> str:
+    """
+    Build the shared part of the feedback prompt.
+
+    Cached: every student graded against the same rubric gets the same
+    prefix, so it is assembled once per class rather than per submission.
+    """
+    relevance_instructions = _RELEVANCE_INSTRUCTIONS.get(relevance_status, _DEFAULT_INSTRUCTIONS)
+
+    return "".join((
+        _FEEDBACK_PROMPT_HEAD,
+        "Context: ", context_type.upper(), " Assignment\nRubric/Criteria used:\n",
+        rubric,
+        "\n\nMANDATORY INSTRUCTIONS:\n",
+        relevance_instructions,
+        _FEEDBACK_PROMPT_TAIL,
+    ))
+
+
+# GenerativeModel instances by model name, shared like the caches above
+_MODELS: Dict[str, Any] = {}
+
+# Circuit breaker: model name -> time of its last failure. Models that failed
+# within the cooldown are skipped so calls go straight to a working fallback.
+_MODEL_FAILURES: Dict[str, float] = {}
+_MODEL_COOLDOWN = float(os.getenv("LLM_MODEL_COOLDOWN", "60"))
+
+# Number of fallback models queried concurrently by the async race. Racing
+# only happens until the primary model has answered since its last failure;
+# after that requests go to one model at a time.
+_RACE_WIDTH = 2
+_PROVEN_MODELS: set = set()
+
+# Errors that mean a model is unavailable, as opposed to one prompt being
+# rejected (safety block, invalid argument): api_core exception class names,
+# then status codes and phrases in the message
+_UNAVAILABLE_ERRORS = frozenset({
+    "NotFound", "InternalServerError", "BadGateway", "ServiceUnavailable",
+    "GatewayTimeout", "DeadlineExceeded", "ResourceExhausted", "TooManyRequests",
+})
+_UNAVAILABLE_RE = re.compile(
+    r"\b(?:404|429|500|502|503|504)\b|not found|unavailable|deadline|timed? ?out|quota|exhausted",
+    re.IGNORECASE,
+)
+
+
+def _is_unavailable(error: Exception) -> bool:
+    """Whether an LLM call failed because the model is down, missing or rate limited."""
+    if isinstance(error, ValueError):
+        # response.text on a blocked or empty candidate
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in _UNAVAILABLE_ERRORS:
+        return True
+    return bool(_UNAVAILABLE_RE.search(str(error)))
+
+# Explicit Gemini context caches for feedback prompt prefixes (opt-in). The
+# API rejects caches below a minimum size, so short prefixes are sent inline.
+_CONTEXT_CACHE_ENABLED = os.getenv("LLM_CONTEXT_CACHE", "false").lower() == "true"
+_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("LLM_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+_CONTEXT_CACHE_TTL = 3600
+# LLMCache.key_for(model, prefix) -> (expires_at, GenerativeModel or None if creation failed)
+_PREFIX_CLIENTS: Dict[str, Tuple[float, Any]] = {}
+_PREFIX_LOCK = threading.Lock()
+
+# Client for the Gemini Batch API (google-genai), created on first batch
+# submission; False once it is known to be unavailable
+_BATCH_CLIENT: Any = None
+_BATCH_FAILED_STATES = frozenset({"JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"})
+
+# API key genai was last configured with. genai.configure() drops the SDK's
+# pooled service clients, so it only runs again when the key changes.
+_CONFIGURED_API_KEY: Optional[str] = None
+_CONFIGURE_LOCK = threading.Lock()
+
+
+def _configure_genai(api_key: str) -> None:
+    """Configure the Gemini SDK once per process (and per API key)."""
+    global _CONFIGURED_API_KEY
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED_API_KEY == api_key:
+            return
+        genai.configure(api_key=api_key)
+        # Models created under another key hold that key's clients
+        _MODELS.clear()
+        _CONFIGURED_API_KEY = api_key
+
 class LLMService:
     """
     Service wrapper for Google's Gemini LLM.
@@ -23,6 +317,10 @@ class LLMService:
         self._client = None
         self._setup_done = False
         self._lock = threading.Lock()
+        self.semantic_cache = _SEMANTIC_CACHE
+        self.llm_cache = _LLM_CACHE
+        self._models = _MODELS
+        self._model_health = _MODEL_FAILURES
 
     def _ensure_setup(self):
         """Lazy initialization of the Gemini client with thread-safety."""
@@ -40,14 +338,187 @@ class LLMService:
                 return
 
             try:
-                genai.configure(api_key=self.api_key)
-                self._client = genai.GenerativeModel(self.model_name)
+                # Reuses the SDK's existing connection when another LLMService
+                # (agents create one per request) already configured it
+                _configure_genai(self.api_key)
+                self._client = self._get_model(self.model_name)
                 self._setup_done = True
             except Exception as e:
                 print(f"WARNING: Failed to initialize Gemini: {e}. Disabling LLM.")
                 self.enabled = False
                 self._setup_done = True
 
+    def _get_model(self, name: str):
+        """Return the GenerativeModel for a model name, creating it on first use."""
+        model = self._models.get(name)
+        if model is None:
+            if _CONFIGURED_API_KEY != self.api_key:  # e.g. after aclose()
+                _configure_genai(self.api_key)
+            model = self._models.setdefault(name, genai.GenerativeModel(name))
+        return model
+
+    def warmup(self) -> None:
+        """
+        Configure the SDK and send a 1-token request in a background thread.
+
+        Moves SDK setup, connection setup and Gemini's cold start off the
+        first real request. Does not block; failures are only logged.
+        """
+        if not self.enabled:
+            return
+
+        def ping():
+            self._ensure_setup()
+            if not self._setup_done:
+                return
+            try:
+                self._client.generate_content("ping", generation_config={"max_output_tokens": 1})
+            except Exception as e:
+                print(f"WARNING: LLM warm-up request failed: {e}")
+
+        threading.Thread(target=ping, name="llm-warmup", daemon=True).start()
+
+    async def aclose(self) -> None:
+        """
+        Close the Gemini connections shared by all LLMService instances.
+
+        Call on application shutdown. A later LLM call reconfigures the SDK
+        and opens new connections.
+        """
+        global _CONFIGURED_API_KEY
+        with _CONFIGURE_LOCK:
+            models = list(_MODELS.values())
+            _MODELS.clear()
+            _CONFIGURED_API_KEY = None
+        # Context-cache clients would keep using the closed transports
+        with _PREFIX_LOCK:
+            models += [client for _, client in _PREFIX_CLIENTS.values() if client is not None]
+            _PREFIX_CLIENTS.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.flush()
+        # The shared service outlives shutdown in tests and reloads
+        self._client = None
+        self._setup_done = False
+
+        # Models share the SDK's default clients; close each transport once
+        closed = set()
+        for model in models:
+            for client in (getattr(model, "_client", None), getattr(model, "_async_client", None)):
+                if client is None or id(client) in closed:
+                    continue
+                closed.add(id(client))
+                try:
+                    result = client.transport.close()
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    print(f"WARNING: Failed to close Gemini client: {e}")
+
+    def _healthy_models(self, models: List[str]) -> List[str]:
+        """Drop models that failed within the cooldown (all of them if none are healthy)."""
+        now = time.time()
+        healthy = [m for m in models if now - self._model_health.get(m, 0) >= _MODEL_COOLDOWN]
+        return healthy or models
+
+    def _mark_failed(self, model: str, error: Optional[Exception] = None) -> None:
+        """
+        Open the circuit breaker for a model.
+
+        With an error, only availability failures count (see
+        _is_unavailable); an error caused by one prompt just moves that
+        request on to the next model.
+        """
+        if error is not None and not _is_unavailable(error):
+            return
+        self._model_health[model] = time.time()
+        _PROVEN_MODELS.discard(model)
+
+    def _cached_response(self, models: List[str], prompt: str) -> Optional[str]:
+        """Return a cached response to this prompt from any of the models, if there is one."""
+        return self.llm_cache.get_any(LLMCache.key_for(model, prompt) for model in models)
+
+    def _store_response(self, model: str, prompt: str, text: str) -> None:
+        """Cache a usable response so identical prompts skip the API."""
+        self.llm_cache.set(LLMCache.key_for(model, prompt), text)
+
+    def _prefix_client(self, model: str, prefix: str):
+        """
+        Return a GenerativeModel bound to a Gemini context cache holding the prefix.
+
+        Returns None when context caching is disabled, the model is a
+        fallback rather than the configured model (caches are billed per
+        model), the prefix is below the API's minimum cache size, or the
+        cache could not be created; the caller then sends the full prompt.
+        """
+        if not _CONTEXT_CACHE_ENABLED or model != self.model_name:
+            return None
+        if len(prefix.encode("utf-8")) < _CONTEXT_CACHE_MIN_TOKENS * _BYTES_PER_TOKEN:
+            return None
+
+        key = LLMCache.key_for(model, prefix)
+        now = time.monotonic()
+        with _PREFIX_LOCK:
+            entry = _PREFIX_CLIENTS.get(key)
+            if entry is not None and entry[0] > now:
+                # None while another thread creates the cache, or after a failure
+                return entry[1]
+
+            for stale in [k for k, (expires_at, _) in _PREFIX_CLIENTS.items() if expires_at <= now]:
+                del _PREFIX_CLIENTS[stale]
+            # Placeholder: concurrent calls send full prompts instead of
+            # waiting on the network call below
+            _PREFIX_CLIENTS[key] = (now + 60, None)
+
+        try:
+            from google.generativeai import caching
+            cached_content = caching.CachedContent.create(
+                model=model if model.startswith("models/") else f"models/{model}",
+                contents=[prefix],
+                ttl=datetime.timedelta(seconds=_CONTEXT_CACHE_TTL),
+            )
+            client = genai.GenerativeModel.from_cached_content(cached_content=cached_content)
+            # Recreate shortly before the server-side cache expires
+            entry = (now + _CONTEXT_CACHE_TTL - 60, client)
+        except Exception as e:
+            print(f"WARNING: Context cache unavailable for {model}: {e}. Sending full prompts.")
+            # Do not retry this prefix until the TTL has passed
+            entry = (now + _CONTEXT_CACHE_TTL, None)
+            client = None
+
+        with _PREFIX_LOCK:
+            _PREFIX_CLIENTS[key] = entry
+        return client
+
+    def _semantic_lookup(
+        self, submission: str, *shared: str, threshold: Optional[float] = None
+    ) -> Tuple[Optional[str], Any, Any]:
+        """
+        Look up a near-duplicate submission in the semantic cache.
+
+        Args:
+            submission: The student's code or text (embedded for similarity;
+                submissions longer than the model reads always miss).
+            shared: Inputs that must match exactly (task, prompt kind, rubric, ...).
+            threshold: Similarity required for a hit; defaults to the cache's threshold.
+
+        Returns:
+            Tuple of (namespace, embedding, cached_response). All None if disabled.
+        """
+        if self.semantic_cache is None:
+            return None, None, None
+        namespace = SemanticCache.namespace_for(*shared)
+        embedding = self.semantic_cache.embed(submission)
+        return namespace, embedding, self.semantic_cache.lookup(namespace, embedding, threshold)
+
+    def _prime_embeddings(self, submissions: List[str]) -> None:
+        """Embed a batch of submissions in one pass ahead of their semantic lookups."""
+        if self.semantic_cache is not None:
+            self.semantic_cache.prime(submissions)
+
+    def _semantic_store(self, namespace: Optional[str], embedding: Any, response: Any) -> None:
+        if self.semantic_cache is not None and namespace is not None:
+            self.semantic_cache.insert(namespace, embedding, response)
+
     def get_full_evaluation(
         self,
         context_type: str,
@@ -82,22 +553,36 @@ class LLMService:
             return "UNCERTAIN", []
 
         self._ensure_setup()
+
+        namespace, embedding, hit = self._semantic_lookup(
+            submission_content, "full", context_type, problem_statement, rubric_context,
+            "\n".join(deterministic_findings), ", ".join(missing_concepts)
+        )
+        if hit is not None:
+            return hit[0], list(hit[1])
         
         prompt = self._build_combined_prompt(
             context_type, submission_content, problem_statement, rubric_context, deterministic_findings, missing_concepts
         )
 
         models_to_try = [self.model_name, "gemini-2.0-flash", "gemini-flash-latest", "gemini-pro-latest"]
+        cached_text = self._cached_response(models_to_try, prompt)
+        if cached_text:
+            return self._parse_combined_response(cached_text)
+
         last_error = ""
 
-        for model in models_to_try:
+        for model in self._healthy_models(models_to_try):
             try:
-                client = genai.GenerativeModel(model)
+                client = self._get_model(model)
                 for try_num in range(3):
                     try:
                         response = client.generate_content(prompt)
                         if response and response.text:
-                            return self._parse_combined_response(response.text)
+                            self._store_response(model, prompt, response.text)
+                            verdict, feedback_lines = self._parse_combined_response(response.text)
+                            self._semantic_store(namespace, embedding, [verdict, feedback_lines])
+                            return verdict, feedback_lines
                         break
                     except Exception as loop_err:
                         last_error = str(loop_err)
@@ -105,9 +590,13 @@ class LLMService:
                             time.sleep(2 ** try_num)
                         else:
                             raise loop_err
+                else:
+                    # Still rate limited after every retry
+                    self._mark_failed(model)
                 continue
             except Exception as e:
                 last_error = str(e)
+                self._mark_failed(model, e)
                 continue
         
         return "UNCERTAIN", []
@@ -128,11 +617,11 @@ TASK 2: SEMANTIC FEEDBACK
 Explain the evaluation result to the student logically. Focus ONLY on logic, mathematical constraints, and data structures as per the findings.
 
 CONTEXT:
-Problem Statement: {problem[:1000]}
+Problem Statement: {_truncate_tokens(problem, _PROBLEM_TOKENS)}
 Rubric: {rubric}
 Automated Findings: {findings_str}
 Missing Concepts: {missing_str}
-Submission: {submission[:4000]}
+Submission: {_truncate_tokens(submission, _SUBMISSION_TOKENS)}
 
 OUTPUT FORMAT (STRICT):
 VERDICT: [RELEVANT/PARTIAL/IRRELEVANT]
@@ -189,6 +678,9 @@ MANDATORY RULES:
         Returns:
             List of feedback strings. Returns empty list on failure or if disabled.
         """
+        if not submission_content.strip():
+            return []
+
         # Serialize mutable inputs for caching manually to ensure we hit cache correctly
         missing_tuple = tuple(missing_concepts) if missing_concepts else ()
         findings_tuple = tuple(deterministic_findings) if deterministic_findings else ()
@@ -197,8 +689,107 @@ MANDATORY RULES:
             context_type, submission_content, rubric_context, findings_tuple, missing_tuple, relevance_status
         )
 
+    def stream_semantic_feedback(
+        self,
+        context_type: str,
+        submission_content: str,
+        rubric_context: str,
+        deterministic_findings: List[str],
+        missing_concepts: List[str] = None,
+        relevance_status: str = "UNCERTAIN"
+    ) -> Iterator[str]:
+        """
+        Streaming variant of generate_semantic_feedback.
+
+        Yields feedback lines as soon as Gemini has produced them instead of
+        waiting for the full response. Cached results are yielded at once.
+        A model that fails before its first line falls back to the next one;
+        a failure mid-stream ends the feedback with the lines already sent.
+        The complete response is cached for the list-returning methods.
+        """
+        if not submission_content.strip():
+            return
+
+        missing_tuple = tuple(missing_concepts) if missing_concepts else ()
+        findings_tuple = tuple(deterministic_findings) if deterministic_findings else ()
+        key = hashkey(
+            self, context_type, submission_content, rubric_context, findings_tuple, missing_tuple, relevance_status
+        )
+        lines = _FEEDBACK_CACHE.get(key)
+        if lines is not None:
+            yield from lines
+            return
+
+        if not self.enabled:
+            return
+
+        self._ensure_setup()
+
+        namespace, embedding, hit = self._semantic_lookup(
+            submission_content, "feedback", context_type, rubric_context,
+            "\n".join(findings_tuple), ", ".join(missing_tuple), relevance_status
+        )
+        if hit is not None:
+            _FEEDBACK_CACHE[key] = list(hit)
+            yield from hit
+            return
+
+        models_to_try = self._feedback_models()
+        prefix, suffix = self._build_prompt_parts(
+            context_type, submission_content, rubric_context, findings_tuple, missing_tuple, relevance_status
+        )
+        prompt = prefix + suffix
+        cached_text = self._cached_response(models_to_try, prompt)
+        if cached_text:
+            lines = _feedback_lines(cached_text)
+            _FEEDBACK_CACHE[key] = lines
+            yield from lines
+            return
+
+        last_error = ""
+        for model in self._healthy_models(models_to_try):
+            lines = []
+            chunks = []
+            buffer = ""
+            try:
+                prefix_client = self._prefix_client(model, prefix)
+                if prefix_client is not None:
+                    stream = prefix_client.generate_content(suffix, stream=True)
+                else:
+                    stream = self._get_model(model).generate_content(prompt, stream=True)
+
+                for chunk in stream:
+                    text = chunk.text
+                    chunks.append(text)
+                    buffer += text
+                    while "\n" in buffer:
+                        line, buffer = buffer.split("\n", 1)
+                        line = line.strip()
+                        if line:
+                            lines.append(line)
+                            yield line
+            except Exception as e:
+                last_error = str(e)
+                self._mark_failed(model, e)
+                if lines:
+                    print(f"WARNING: LLM feedback stream from {model} broke off: {last_error}")
+                    return
+                continue
+
+            line = buffer.strip()
+            if line:
+                lines.append(line)
+                yield line
+            if lines:
+                self._store_response(model, prompt, "".join(chunks))
+                self._semantic_store(namespace, embedding, lines)
+                _FEEDBACK_CACHE[key] = lines
+                return
+
+        print(f"WARNING: All LLM models failed. Last error: {last_error}. Falling back to rule-based feedback.")
+
     # Cache semantic feedback for up to 24 hours. A 1000 item cache avoids redundant API calls across multiple runs.
-    @cached(cache=TTLCache(maxsize=1000, ttl=86400))
+    @cached(cache=_FEEDBACK_CACHE)
     def _cached_generate_semantic_feedback(
         self, 
         context_type: str, 
@@ -213,25 +804,39 @@ MANDATORY RULES:
             return []
 
         self._ensure_setup()
+
+        namespace, embedding, hit = self._semantic_lookup(
+            submission_content, "feedback", context_type, rubric_context,
+            "\n".join(deterministic_findings), ", ".join(missing_concepts), relevance_status
+        )
+        if hit is not None:
+            return list(hit)
         
-        # Try a few common model identifiers to avoid 404s/Quotas
-        models_to_try = [self.model_name, "gemini-2.0-flash", "gemini-flash-latest", "gemini-2.5-flash", "gemini-pro-latest"]
-        # Remove duplicates while preserving order
-        models_to_try = list(dict.fromkeys(m for m in models_to_try if m))
-        
+        models_to_try = self._feedback_models()
+        prefix, suffix = self._build_prompt_parts(context_type, submission_content, rubric_context, deterministic_findings, missing_concepts, relevance_status)
+        prompt = prefix + suffix
+        cached_text = self._cached_response(models_to_try, prompt)
+        if cached_text:
+            return _feedback_lines(cached_text)
+
         last_error = ""
-        for model in models_to_try:
+        for model in self._healthy_models(models_to_try):
             try:
-                client = genai.GenerativeModel(model)
-                prompt = self._build_prompt(context_type, submission_content, rubric_context, deterministic_findings, missing_concepts, relevance_status)
+                client = self._get_model(model)
+                prefix_client = self._prefix_client(model, prefix)
                 
                 # Manual exponential backoff for rate limiting when submitting highly concurrent batches
                 for try_num in range(3):
                     try:
-                        response = client.generate_content(prompt)
+                        if prefix_client is not None:
+                            response = prefix_client.generate_content(suffix)
+                        else:
+                            response = client.generate_content(prompt)
                         if response.text:
-                            lines = [line.strip() for line in response.text.split("\n") if line.strip()]
-                            return lines if lines else [response.text.strip()]
+                            self._store_response(model, prompt, response.text)
+                            lines = _feedback_lines(response.text)
+                            self._semantic_store(namespace, embedding, lines)
+                            return lines
                         break
                     except Exception as loop_err:
                         last_error = str(loop_err)
@@ -239,16 +844,161 @@ MANDATORY RULES:
                             time.sleep(2 ** try_num)  # back off: 1s, 2s, 4s
                         else:
                             raise loop_err
+                else:
+                    # Still rate limited after every retry
+                    self._mark_failed(model)
                 
                 continue
 
             except Exception as e:
                 last_error = str(e)
+                self._mark_failed(model, e)
                 continue
                 
         print(f"WARNING: All LLM models failed. Last error: {last_error}. Falling back to rule-based feedback.")
         return []
 
+    def _feedback_models(self) -> List[str]:
+        """Model identifiers to try for feedback, to avoid 404s/Quotas."""
+        models_to_try = [self.model_name, "gemini-2.0-flash", "gemini-flash-latest", "gemini-2.5-flash", "gemini-pro-latest"]
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(m for m in models_to_try if m))
+
+    async def generate_semantic_feedback_async(
+        self,
+        context_type: str,
+        submission_content: str,
+        rubric_context: str,
+        deterministic_findings: List[str],
+        missing_concepts: List[str] = None,
+        relevance_status: str = "UNCERTAIN"
+    ) -> List[str]:
+        """
+        Async variant of generate_semantic_feedback.
+
+        Candidate models are raced a few at a time; the first non-empty
+        response wins and the remaining requests are cancelled. Shares the
+        response cache with the sync method.
+        """
+        if not submission_content.strip():
+            return []
+
+        missing_tuple = tuple(missing_concepts) if missing_concepts else ()
+        findings_tuple = tuple(deterministic_findings) if deterministic_findings else ()
+        key = hashkey(
+            self, context_type, submission_content, rubric_context, findings_tuple, missing_tuple, relevance_status
+        )
+        lines = _FEEDBACK_CACHE.get(key)
+        if lines is not None:
+            return lines
+
+        if not self.enabled:
+            return []
+
+        self._ensure_setup()
+
+        # Cache lookups may embed text or call Redis; keep them off the event loop
+        namespace, embedding, hit = await asyncio.to_thread(
+            self._semantic_lookup,
+            submission_content, "feedback", context_type, rubric_context,
+            "\n".join(findings_tuple), ", ".join(missing_tuple), relevance_status
+        )
+        if hit is not None:
+            return list(hit)
+
+        parts = self._build_prompt_parts(context_type, submission_content, rubric_context, findings_tuple, missing_tuple, relevance_status)
+        prompt = "".join(parts)
+        models = self._feedback_models()
+        text = await asyncio.to_thread(self._cached_response, models, prompt)
+        if not text:
+            text = await self._race_models_async(models, prompt, parts)
+        if not text:
+            return []
+
+        lines = _feedback_lines(text)
+        await asyncio.to_thread(self._semantic_store, namespace, embedding, lines)
+        _FEEDBACK_CACHE[key] = lines
+        return lines
+
+    async def _generate_async(
+        self,
+        model: str,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        parts: Optional[Tuple[str, str]] = None
+    ) -> str:
+        """
+        Call one model asynchronously, backing off on rate limiting.
+
+        If the prompt's (prefix, suffix) parts are given and the prefix is in
+        a Gemini context cache, only the suffix is sent.
+        """
+        client = self._get_model(model)
+        if parts is not None and _CONTEXT_CACHE_ENABLED:
+            prefix_client = await asyncio.to_thread(self._prefix_client, model, parts[0])
+            if prefix_client is not None:
+                client, prompt = prefix_client, parts[1]
+        for try_num in range(3):
+            try:
+                response = await client.generate_content_async(prompt, generation_config=generation_config)
+                return response.text if response else ""
+            except Exception as loop_err:
+                err_str = str(loop_err).lower()
+                if "429" in err_str or "quota" in err_str or "exhausted" in err_str:
+                    await asyncio.sleep(2 ** try_num)  # back off: 1s, 2s, 4s
+                else:
+                    raise
+        return ""
+
+    async def _race_models_async(
+        self, models: List[str], prompt: str, parts: Optional[Tuple[str, str]] = None
+    ) -> str:
+        """
+        Send the prompt to several models concurrently.
+
+        Until the primary model has answered since its last failure, healthy
+        models are raced _RACE_WIDTH at a time, in order, so a broken primary
+        costs one round trip instead of a sequential retry chain. Once it is
+        proven, models are tried one at a time so each request is billed once.
+
+        Returns:
+            Text of the first non-empty response, or "" if every model failed.
+        """
+        async def attempt(model: str) -> Tuple[str, str]:
+            try:
+                return model, await self._generate_async(model, prompt, parts=parts)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._mark_failed(model, e)
+                raise
+
+        primary = models[0] if models else None
+        models = self._healthy_models(models)
+        width = 1 if models and models[0] == primary and primary in _PROVEN_MODELS else _RACE_WIDTH
+        last_error = ""
+        for start in range(0, len(models), width):
+            tasks = [asyncio.create_task(attempt(model)) for model in models[start:start + width]]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        model, text = await next_done
+                    except Exception as e:
+                        last_error = str(e)
+                        continue
+                    if text:
+                        _PROVEN_MODELS.add(model)
+                        await asyncio.to_thread(self._store_response, model, prompt, text)
+                        return text
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # Let the losers finish cancelling and retrieve their exceptions
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        print(f"WARNING: All LLM models failed. Last error: {last_error}. Falling back to rule-based feedback.")
+        return ""
+
     def _build_prompt(
         self, 
         context_type: str, 
@@ -258,66 +1008,39 @@ MANDATORY RULES:
         missing: List[str] = None,
         relevance_status: str = "UNCERTAIN"
     ) -> str:
-        findings_str = "\n".join(f"- {f}" for f in findings)
-        missing_str = ", ".join(missing) if missing else "None"
-
-        if relevance_status == "IRRELEVANT":
-            relevance_instructions = """
-1. Format your response into these exact sections:
-    **Summary**: State clearly that the submission is irrelevant to the assigned problem. Briefly mention what their code/text actually does (as context).
-    
-    **Corrections Needed**: 
-    - DO NOT critique the student's code for style, comments, or naming. It is irrelevant.
-    - INSTEAD, provide a comprehensive "How to Solve the Assigned Problem" guide.
-    - Include high-level Pseudo-code and logical steps for the ACTUAL assigned task.
-    - Be a mentor: help them understand the problem they missed.
-    
-    **Strengths**: Mention 1 minor technical strength of their code (syntax/structure) ONLY if it exists, otherwise omit this section.
-"""
-        else:
-            relevance_instructions = """
-1. Format your response into these exact sections:
-    **Summary**: [Brief 1-sentence explanation of what the code/content is trying to do]
-    
-    **Corrections Needed**: [A detailed paragraph explaining conceptual gaps. Behave like a patient mentor. Give precise examples of how they should improve their underlying logic.]
-    
-    **Strengths**: [1-3 concise lines highlighting what was done well]
-
-CRITICAL AI RULE: If the "Automated Findings" do not explicitly complain about a lack of comments or documentation, you MUST NEVER mention comments, documentation, styling, or variable naming anywhere in your feedback. Focus 100% on algorithm flow, mathematical constraints, and data-structures!
-"""
-        
-        base_prompt = f"""
-You are a helpful Teaching Assistant explaining evaluation results.
-Your goal is to explain the following evaluation results and findings to a student.
-DO NOT assign a score. The score has already been determined by the system.
-DO NOT change weights or grading criteria.
-DO NOT invent new criteria. Focus ONLY on the provided context.
-Only explain based on provided facts and findings.
-
-Context: {context_type.upper()} Assignment
-Rubric/Criteria used:
-{rubric}
+        return "".join(self._build_prompt_parts(context_type, submission, rubric, findings, missing, relevance_status))
 
-Automated Findings (Facts that determine the score):
-{findings_str}
-
-Missing Concepts (Keywords to explain):
-{missing_str}
-
-Student Submission (for context):
-{submission[:4000]}
-
-MANDATORY INSTRUCTIONS:
-{relevance_instructions}
+    def _build_prompt_parts(
+        self,
+        context_type: str,
+        submission: str,
+        rubric: str,
+        findings: List[str],
+        missing: List[str] = None,
+        relevance_status: str = "UNCERTAIN"
+    ) -> Tuple[str, str]:
+        """
+        Build the feedback prompt as (prefix, suffix).
 
-2. Explain logically WHY the given findings lead to the evaluation result.
-3. If 'Missing Concepts' are provided, gently suggest they consider those domain terms if they apply, but DO NOT artificially force them into sentences.
-4. Keep feedback encouraging but technical.
-5. Start directly with the output content (no "Here is...").
-6. Do NOT use markdown headers like "##". Use bold keys exactly as provided (e.g., "**Summary**:").
+        The prefix (instructions, assignment type, rubric) is the same for
+        every student graded against one rubric, so it comes first where
+        Gemini can reuse it as a cached prefix; the suffix holds the
+        per-student findings and submission.
+        """
+        findings_str = "- " + "\n- ".join(findings) if findings else ""
+        missing_str = ", ".join(missing) if missing else "None"
 
-"""
-        return base_prompt
+        prefix = _feedback_prompt_prefix(context_type, rubric, relevance_status)
+        suffix = "".join((
+            "Automated Findings (Facts that determine the score):\n",
+            findings_str,
+            "\n\nMissing Concepts (Keywords to explain):\n",
+            missing_str,
+            "\n\nStudent Submission (for context):\n",
+            _truncate_tokens(submission, _SUBMISSION_TOKENS),
+            "\n",
+        ))
+        return prefix, suffix
 
     def check_relevance(
         self,
@@ -336,12 +1059,387 @@ MANDATORY INSTRUCTIONS:
         Returns:
             "RELEVANT" if submission genuinely attempts to solve the problem.
             "PARTIAL" if submission shows some understanding but incomplete/off-track.
-            "IRRELEVANT" if completely unrelated or wrong problem.
+            "IRRELEVANT" if completely unrelated or wrong problem. Empty code,
+                near-empty text and copies of the problem statement get this
+                verdict without an LLM call.
             "UNCERTAIN" if LLM failed or disabled (fail-closed for safety).
         """
         return self._cached_check_relevance(problem_statement, submission_content, context_type)
 
-    @cached(cache=TTLCache(maxsize=2000, ttl=86400))
+    def check_relevance_bulk(
+        self,
+        problem_statement: str,
+        submissions: List[str],
+        context_type: str = "code"
+    ) -> List[str]:
+        """
+        Check relevance of many submissions to the same problem.
+
+        Submissions are judged up to 8 per request, so the problem statement
+        and rules are sent once per group instead of once per submission.
+        Groups whose response cannot be parsed, and submissions missing from
+        a response, fall back to check_relevance. Groups that hit a rate limit
+        or an unavailable model get UNCERTAIN (not cached) rather than one
+        request per submission. Shares its cache with check_relevance.
+
+        Args:
+            problem_statement: The task description.
+            submissions: Students' code or texts.
+            context_type: "code" or "content".
+
+        Returns:
+            Verdicts in the same order as submissions (see check_relevance).
+        """
+        verdicts: List[Optional[str]] = [None] * len(submissions)
+        pending = []
+        for i, submission in enumerate(submissions):
+            verdict = _RELEVANCE_CACHE.get(hashkey(self, problem_statement, submission, context_type))
+            if verdict is None and not self.enabled:
+                verdict = "UNCERTAIN"
+            if verdict is None:
+                verdict = _trivial_verdict(problem_statement, submission, context_type)
+                if verdict:
+                    _RELEVANCE_CACHE[hashkey(self, problem_statement, submission, context_type)] = verdict
+            if verdict is None:
+                pending.append(i)
+            else:
+                verdicts[i] = verdict
+
+        if pending:
+            self._ensure_setup()
+            self._prime_embeddings([submissions[i] for i in pending])
+
+        # Near-duplicates of already judged submissions need no request
+        lookups = {}
+        for i in pending:
+            namespace, embedding, hit = self._semantic_lookup(
+                submissions[i], "relevance", context_type, problem_statement,
+                threshold=_RELEVANCE_SEMANTIC_THRESHOLD,
+            )
+            if hit is not None:
+                verdicts[i] = hit
+            else:
+                lookups[i] = (namespace, embedding)
+        pending = list(lookups)
+
+        groups = [
+            pending[start:start + _BULK_RELEVANCE_SIZE]
+            for start in range(0, len(pending), _BULK_RELEVANCE_SIZE)
+        ]
+        if not groups:
+            return verdicts
+
+        # Groups are independent requests; send them concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(groups), 8)) as executor:
+            group_results = list(executor.map(
+                lambda group: self._query_relevance_bulk(
+                    problem_statement, [submissions[i] for i in group], context_type
+                ),
+                groups,
+            ))
+
+        for group, results in zip(groups, group_results):
+            if results is None:
+                # Not cached: the next run should ask again
+                for i in group:
+                    verdicts[i] = "UNCERTAIN"
+                continue
+            for i, verdict in zip(group, results):
+                if verdict is None:
+                    verdict = self.check_relevance(problem_statement, submissions[i], context_type)
+                else:
+                    _RELEVANCE_CACHE[hashkey(self, problem_statement, submissions[i], context_type)] = verdict
+                    if verdict != "UNCERTAIN":
+                        self._semantic_store(*lookups[i], verdict)
+                verdicts[i] = verdict
+
+        return verdicts
+
+    async def check_relevance_async(
+        self,
+        problem_statement: str,
+        submission_content: str,
+        context_type: str = "code"
+    ) -> str:
+        """
+        Async variant of check_relevance. Shares its response cache.
+        """
+        key = hashkey(self, problem_statement, submission_content, context_type)
+        verdict = _RELEVANCE_CACHE.get(key)
+        if verdict is not None:
+            return verdict
+
+        if not self.enabled:
+            return "UNCERTAIN"
+
+        verdict = _trivial_verdict(problem_statement, submission_content, context_type)
+        if verdict:
+            _RELEVANCE_CACHE[key] = verdict
+            return verdict
+
+        self._ensure_setup()
+
+        # Cache lookups may embed text or call Redis; keep them off the event loop
+        namespace, embedding, hit = await asyncio.to_thread(functools.partial(
+            self._semantic_lookup,
+            submission_content, "relevance", context_type, problem_statement,
+            threshold=_RELEVANCE_SEMANTIC_THRESHOLD,
+        ))
+        if hit is not None:
+            return hit
+
+        prompt = self._build_relevance_prompt(problem_statement, submission_content, context_type)
+        model = self.model_name or "gemini-2.0-flash"
+        cached_text = await asyncio.to_thread(self._cached_response, [model], prompt)
+        verdict = self._parse_verdict(cached_text) if cached_text else None
+        if not verdict:
+            verdict = "UNCERTAIN"
+            for attempt in range(2):
+                try:
+                    text = await self._generate_async(model, prompt, _RELEVANCE_GENERATION_CONFIG)
+                except Exception as e:
+                    print(f"LLM Relevance Check failed: {e}")
+                    continue
+                parsed = self._parse_verdict(text) if text else None
+                if parsed:
+                    await asyncio.to_thread(self._store_response, model, prompt, text)
+                    verdict = parsed
+                    break
+
+        if verdict != "UNCERTAIN":
+            await asyncio.to_thread(self._semantic_store, namespace, embedding, verdict)
+        _RELEVANCE_CACHE[key] = verdict
+        return verdict
+
+    async def check_relevance_batch_async(
+        self,
+        items: List[Tuple[str, str, str]],
+        concurrency: int = 8
+    ) -> List[str]:
+        """
+        Check relevance of many submissions concurrently.
+
+        Args:
+            items: (problem_statement, submission_content, context_type) tuples
+            concurrency: Maximum number of LLM requests in flight
+
+        Returns:
+            Verdicts in the same order as items ("UNCERTAIN" for failures)
+        """
+        if self.enabled:
+            await asyncio.to_thread(self._prime_embeddings, [item[1] for item in items])
+        results = await self._gather_limited(
+            [functools.partial(self.check_relevance_async, *item) for item in items], concurrency
+        )
+        return [result if isinstance(result, str) else "UNCERTAIN" for result in results]
+
+    async def generate_semantic_feedback_batch_async(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 8
+    ) -> List[List[str]]:
+        """
+        Generate feedback for many submissions concurrently.
+
+        Args:
+            items: Keyword arguments for generate_semantic_feedback_async, one dict per submission
+            concurrency: Maximum number of submissions being processed at once
+
+        Returns:
+            Feedback lines in the same order as items ([] for failures)
+        """
+        if self.enabled:
+            await asyncio.to_thread(
+                self._prime_embeddings, [item.get("submission_content", "") for item in items]
+            )
+        results = await self._gather_limited(
+            [functools.partial(self.generate_semantic_feedback_async, **item) for item in items], concurrency
+        )
+        return [result if isinstance(result, list) else [] for result in results]
+
+    async def _gather_limited(self, calls: List[Callable[[], Awaitable[Any]]], concurrency: int) -> List[Any]:
+        """Run coroutine factories with at most `concurrency` running; exceptions are returned, not raised."""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        results = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"WARNING: Batched LLM call failed: {result}")
+        return results
+
+    def generate_semantic_feedback_batch_offline(
+        self,
+        items: List[Dict[str, Any]],
+        timeout: float = 24 * 3600
+    ) -> List[List[str]]:
+        """
+        Generate feedback for a whole class through the Gemini Batch API.
+
+        Meant for non-interactive grading runs: batch jobs are cheaper than
+        individual calls but may take minutes to hours. Empty submissions and
+        submissions answered by the feedback, semantic or response caches are
+        not submitted, and results are cached like generate_semantic_feedback's.
+        If the batch path is unavailable
+        (google-genai not installed) or the job fails, the items are processed
+        with generate_semantic_feedback one by one.
+
+        Args:
+            items: Keyword arguments for generate_semantic_feedback, one dict per submission
+            timeout: Seconds to wait for the batch job
+
+        Returns:
+            Feedback lines in the same order as items ([] for failures)
+        """
+        results: List[Optional[List[str]]] = [None] * len(items)
+        pending = []  # (index, cache key, prompt, namespace, embedding)
+        models = self._feedback_models()
+        for index, item in enumerate(items):
+            # Same steps as generate_semantic_feedback, minus the LLM call
+            if not item["submission_content"].strip():
+                results[index] = []
+                continue
+            findings_tuple = tuple(item["deterministic_findings"] or ())
+            missing_tuple = tuple(item.get("missing_concepts") or ())
+            relevance_status = item.get("relevance_status", "UNCERTAIN")
+            key = hashkey(
+                self, item["context_type"], item["submission_content"], item["rubric_context"],
+                findings_tuple, missing_tuple, relevance_status,
+            )
+            lines = _FEEDBACK_CACHE.get(key)
+            if lines is None and not self.enabled:
+                lines = []
+            if lines is not None:
+                results[index] = lines
+                continue
+
+            self._ensure_setup()
+            namespace, embedding, hit = self._semantic_lookup(
+                item["submission_content"], "feedback", item["context_type"], item["rubric_context"],
+                "\n".join(findings_tuple), ", ".join(missing_tuple), relevance_status
+            )
+            if hit is not None:
+                results[index] = _FEEDBACK_CACHE[key] = list(hit)
+                continue
+
+            prompt = self._build_prompt(
+                item["context_type"], item["submission_content"], item["rubric_context"],
+                findings_tuple, missing_tuple, relevance_status,
+            )
+            text = self._cached_response(models, prompt)
+            if text:
+                results[index] = _FEEDBACK_CACHE[key] = _feedback_lines(text)
+                continue
+            pending.append((index, key, prompt, namespace, embedding))
+
+        if pending:
+            model = self.model_name or "gemini-2.0-flash"
+            job_name = self.submit_batch([entry[2] for entry in pending], model)
+            responses = self.poll_batch(job_name, timeout) if job_name else []
+            for (index, key, prompt, namespace, embedding), text in zip(pending, responses):
+                if text:
+                    self._store_response(model, prompt, text)
+                    lines = _feedback_lines(text)
+                    self._semantic_store(namespace, embedding, lines)
+                    results[index] = _FEEDBACK_CACHE[key] = lines
+
+        # Not answered by the batch job: fall back to a direct call
+        return [
+            lines if lines is not None else self.generate_semantic_feedback(**item)
+            for item, lines in zip(items, results)
+        ]
+
+    def submit_batch(self, prompts: List[str], model: Optional[str] = None) -> Optional[str]:
+        """
+        Submit prompts as one inline Gemini batch job.
+
+        Args:
+            prompts: Prompt texts; responses come back in the same order
+            model: Model to run; defaults to the configured model
+
+        Returns:
+            Batch job name for poll_batch(), or None if the job could not be created.
+        """
+        client = self._get_batch_client()
+        if client is None:
+            return None
+
+        model = model or self.model_name or "gemini-2.0-flash"
+        requests = [{"contents": [{"parts": [{"text": prompt}], "role": "user"}]} for prompt in prompts]
+        try:
+            job = client.batches.create(
+                model=model if model.startswith("models/") else f"models/{model}",
+                src=requests,
+                config={"display_name": f"evaluator-feedback-{int(time.time())}"},
+            )
+            return job.name
+        except Exception as e:
+            print(f"WARNING: Failed to submit Gemini batch job: {e}")
+            return None
+
+    def poll_batch(self, job_name: str, timeout: float = 24 * 3600) -> List[Optional[str]]:
+        """
+        Wait for a batch job and collect its responses.
+
+        Polls with exponential backoff (5s doubling up to 60s).
+
+        Args:
+            job_name: Name returned by submit_batch()
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            Response text per prompt, in submission order (None for failed items).
+            Empty list if the job failed or timed out.
+        """
+        client = self._get_batch_client()
+        if client is None:
+            return []
+
+        deadline = time.monotonic() + timeout
+        delay = 5.0
+        while True:
+            try:
+                job = client.batches.get(name=job_name)
+            except Exception as e:
+                print(f"WARNING: Failed to poll Gemini batch job {job_name}: {e}")
+                job = None
+
+            state = job.state.name if job is not None and job.state is not None else ""
+            if state == "JOB_STATE_SUCCEEDED":
+                break
+            if state in _BATCH_FAILED_STATES:
+                print(f"WARNING: Gemini batch job {job_name} ended with {state}")
+                return []
+            if time.monotonic() + delay > deadline:
+                print(f"WARNING: Gemini batch job {job_name} timed out")
+                return []
+            time.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+        texts = []
+        for inlined in (job.dest.inlined_responses if job.dest else None) or []:
+            try:
+                texts.append(inlined.response.text if inlined.response else None)
+            except Exception:
+                texts.append(None)
+        return texts
+
+    def _get_batch_client(self):
+        """google-genai client for the Batch API, created on first use (None if unavailable)."""
+        global _BATCH_CLIENT
+        if _BATCH_CLIENT is None:
+            try:
+                from google import genai as genai_client
+                _BATCH_CLIENT = genai_client.Client(api_key=self.api_key)
+            except Exception as e:
+                print(f"WARNING: Gemini Batch API unavailable: {e}. Using direct calls.")
+                _BATCH_CLIENT = False
+        return _BATCH_CLIENT or None
+
+    @cached(cache=_RELEVANCE_CACHE)
     def _cached_check_relevance(
         self,
         problem_statement: str,
@@ -351,76 +1449,155 @@ MANDATORY INSTRUCTIONS:
         if not self.enabled:
             return "UNCERTAIN"
 
+        trivial = _trivial_verdict(problem_statement, submission_content, context_type)
+        if trivial:
+            return trivial
+
         self._ensure_setup()
-        
-        prompt = f"""
+
+        namespace, embedding, hit = self._semantic_lookup(
+            submission_content, "relevance", context_type, problem_statement,
+            threshold=_RELEVANCE_SEMANTIC_THRESHOLD,
+        )
+        if hit is not None:
+            return hit
+
+        prompt = self._build_relevance_prompt(problem_statement, submission_content, context_type)
+        verdict = self._query_relevance(prompt)
+        if verdict != "UNCERTAIN":
+            self._semantic_store(namespace, embedding, verdict)
+        return verdict
+
+    def _build_relevance_prompt(self, problem_statement: str, submission_content: str, context_type: str) -> str:
+        return f"""
 You are an expert evaluator for an automated grading system.
 Your task is to determine if the {context_type} submission GENUINELY ATTEMPTS to solve the specific problem described.
 
 Problem Statement:
-{problem_statement[:1500]}
+{_truncate_tokens(problem_statement, _RELEVANCE_PROBLEM_TOKENS)}
 
 Submission:
-{submission_content[:3000]}
+{_truncate_tokens(submission_content, _RELEVANCE_SUBMISSION_TOKENS)}
 
-CRITICAL EVALUATION RULES:
-1. **Identify the Core Logic Requirement**: What is the unique algorithmic or conceptual task? (e.g., "Implement a Trie", "Calculate GCD", "Summarize Photosynthesis").
-2. **Identify the Submission's Actual Logic**: What does this code/text actually do?
-3. **Ignore Superficial Similarities**: DO NOT be fooled by:
-    - Common programming terms (`int`, `vector`, `List`, `return`).
-    - Standard boilerplate templates.
-    - Matching words that are used in a different context.
-4. **Verdicts**:
-    - **IRRELEVANT**: If the submission is for a different problem, is just boilerplate, or contains no logic related to the core task.
-    - **PARTIAL**: If the submission shows some understanding of the problem domain but is incomplete, significantly off-track, or only addresses a small part.
-    - **RELEVANT**: If the submission shows a clear attempt to solve the specific problem, even if it has bugs or is unfinished.
-    - **UNCERTAIN**: Only if you genuinely cannot determine relevance from the provided information.
+{_RELEVANCE_RULES}Response Format (JSON):
+{{"reasoning": "[1-2 sentences explaining the core logic mismatch or match]", "verdict": "[RELEVANT/PARTIAL/IRRELEVANT/UNCERTAIN]"}}
+"""
+
+    def _build_bulk_relevance_prompt(self, problem_statement: str, submissions: List[str], context_type: str) -> str:
+        numbered = "\n\n".join(
+            f"Submission {i}:\n{_truncate_tokens(submission, _RELEVANCE_SUBMISSION_TOKENS)}"
+            for i, submission in enumerate(submissions, 1)
+        )
+        return f"""
+You are an expert evaluator for an automated grading system.
+Your task is to determine, for each of the {len(submissions)} {context_type} submissions below, if it GENUINELY ATTEMPTS to solve the specific problem described.
+Judge every submission on its own.
+
+Problem Statement:
+{_truncate_tokens(problem_statement, _RELEVANCE_PROBLEM_TOKENS)}
+
+{numbered}
 
-Response Format:
-Reasoning: [1-2 sentences explaining the core logic mismatch or match]
-Verdict: [RELEVANT/PARTIAL/IRRELEVANT/UNCERTAIN]
+{_RELEVANCE_RULES}Response Format (JSON array, one entry per submission):
+[{{"id": 1, "reasoning": "[1-2 sentences explaining the core logic mismatch or match]", "verdict": "[RELEVANT/PARTIAL/IRRELEVANT/UNCERTAIN]"}}, ...]
 """
+
+    def _query_relevance_bulk(
+        self, problem_statement: str, submissions: List[str], context_type: str
+    ) -> Optional[List[Optional[str]]]:
+        """
+        Judge a group of submissions in one request.
+
+        Returns:
+            One verdict per submission, with None where the response gave no
+            usable verdict (those are checked one by one). None instead of a
+            list if the model is rate limited or unavailable, when one request
+            per submission would only add load.
+        """
+        prompt = self._build_bulk_relevance_prompt(problem_statement, submissions, context_type)
+        model = self.model_name or "gemini-2.0-flash"
+        text = self._cached_response([model], prompt)
+        if not text:
+            try:
+                response = self._generate_with_backoff(
+                    self._get_model(model), prompt, _BULK_RELEVANCE_GENERATION_CONFIG
+                )
+            except Exception as e:
+                if _is_unavailable(e):
+                    print(f"LLM Bulk Relevance Check failed: {e}.")
+                    self._mark_failed(model, e)
+                    return None
+                print(f"LLM Bulk Relevance Check failed: {e}. Checking submissions one by one.")
+                return [None] * len(submissions)
+            if response is None:
+                print("LLM Bulk Relevance Check still rate limited after retries.")
+                self._mark_failed(model)
+                return None
+            try:
+                text = response.text
+            except ValueError as e:
+                # Blocked response; judge the submissions separately
+                print(f"LLM Bulk Relevance Check returned no text: {e}. Checking submissions one by one.")
+                return [None] * len(submissions)
+
+        try:
+            entries = _json_loads(text)
+            by_id = {
+                entry["id"]: entry["verdict"].upper()
+                for entry in entries
+                if isinstance(entry, dict) and isinstance(entry.get("id"), int) and isinstance(entry.get("verdict"), str)
+            }
+        except (TypeError, ValueError) as e:
+            print(f"WARNING: Could not parse bulk relevance response: {e}. Checking submissions one by one.")
+            return [None] * len(submissions)
+
+        verdicts = [by_id.get(i) for i in range(1, len(submissions) + 1)]
+        verdicts = [verdict if verdict in _VERDICT_PRIORITY else None for verdict in verdicts]
+        if any(verdict is not None for verdict in verdicts):
+            self._store_response(model, prompt, text)
+        return verdicts
+
+    def _generate_with_backoff(self, client, prompt: str, generation_config: Optional[Dict[str, Any]] = None):
+        """
+        Call generate_content, backing off on rate limits (1s, 2s, 4s).
+
+        Returns:
+            The response, or None if still rate limited after every retry.
+            Other errors are raised.
+        """
+        for try_num in range(3):
+            try:
+                return client.generate_content(prompt, generation_config=generation_config)
+            except Exception as loop_err:
+                err_str = str(loop_err).lower()
+                if "429" in err_str or "quota" in err_str or "exhausted" in err_str:
+                    time.sleep(2 ** try_num)
+                else:
+                    raise
+        return None
+
+    def _query_relevance(self, prompt: str) -> str:
+        """Run the relevance prompt with retries and parse the verdict."""
+        # Use the configured model
+        model = self.model_name or "gemini-2.0-flash"
+        cached_text = self._cached_response([model], prompt)
+        verdict = self._parse_verdict(cached_text) if cached_text else None
+        if verdict:
+            return verdict
+
         max_retries = 2
         for attempt in range(max_retries):
             try:
-                # Use the configured model
-                client = genai.GenerativeModel(self.model_name or "gemini-2.0-flash")
-                response = None
-                
-                # Check for rate limiting
-                for inner_try in range(3):
-                    try:
-                        response = client.generate_content(prompt)
-                        break
-                    except Exception as loop_err:
-                        err_str = str(loop_err).lower()
-                        if "429" in err_str or "quota" in err_str or "exhausted" in err_str:
-                            time.sleep(2 ** inner_try)
-                        else:
-                            raise loop_err
+                client = self._get_model(model)
+                response = self._generate_with_backoff(client, prompt, _RELEVANCE_GENERATION_CONFIG)
 
                 if not response or not response.text:
                     continue
-                    
-                text = response.text.strip().upper()
-                
-                # Parse verdict with priority on the "Verdict: " prefix
-                if "VERDICT: RELEVANT" in text or "VERDICT:RELEVANT" in text:
-                    return "RELEVANT"
-                if "VERDICT: PARTIAL" in text or "VERDICT:PARTIAL" in text:
-                    return "PARTIAL"
-                if "VERDICT: IRRELEVANT" in text or "VERDICT:IRRELEVANT" in text:
-                    return "IRRELEVANT"
-                if "VERDICT: UNCERTAIN" in text or "VERDICT:UNCERTAIN" in text:
-                    return "UNCERTAIN"
-                
-                # Loose fallback - look for standalone verdict words
-                if "RELEVANT" in text and "IRRELEVANT" not in text and "PARTIAL" not in text:
-                    return "RELEVANT"
-                if "IRRELEVANT" in text:
-                    return "IRRELEVANT"
-                if "PARTIAL" in text:
-                    return "PARTIAL"
+
+                verdict = self._parse_verdict(response.text)
+                if verdict:
+                    self._store_response(model, prompt, response.text)
+                    return verdict
                     
             except Exception as e:
                 print(f"LLM Relevance Check failed: {e}")
@@ -429,6 +1606,32 @@ Verdict: [RELEVANT/PARTIAL/IRRELEVANT/UNCERTAIN]
         # Fail-closed: If LLM fails, treat as uncertain (which will be handled conservatively)
         return "UNCERTAIN"
 
+    def _parse_verdict(self, response_text: str) -> Optional[str]:
+        """Extract the relevance verdict from a response, or None if there is none."""
+        text = response_text.strip()
+
+        # Structured response from JSON mode
+        if text.startswith("{"):
+            try:
+                verdict = str(json.loads(text).get("verdict", "")).strip().upper()
+            except (ValueError, AttributeError):
+                verdict = ""
+            if verdict in _VERDICT_PRIORITY:
+                return verdict
+
+        # Parse verdict with priority on the "Verdict: " prefix (one scan)
+        labels = {label.upper() for label in _VERDICT_RE.findall(text)}
+        if labels:
+            return next(label for label in _VERDICT_PRIORITY if label in labels)
+        
+        # Loose fallback - look for standalone verdict words
+        # (IRRELEVANT beats PARTIAL beats RELEVANT)
+        words = {word.upper() for word in _VERDICT_WORD_RE.findall(text)}
+        for verdict in ("IRRELEVANT", "PARTIAL", "RELEVANT"):
+            if verdict in words:
+                return verdict
+        return None
+
     def parse_rubric_text(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Uses LLM to convert a plain text rubric description into the structured 
@@ -479,29 +1682,44 @@ Verdict: [RELEVANT/PARTIAL/IRRELEVANT/UNCERTAIN]
         {text}
         """
         
+        model = self.model_name or "gemini-2.0-flash"
+        cached_text = self._cached_response([model], prompt)
         max_retries = 2
         for attempt in range(max_retries):
             try:
-                client = genai.GenerativeModel(self.model_name or "gemini-2.0-flash")
-                response = client.generate_content(prompt)
+                if cached_text:
+                    # A cached response already parsed once; no API call needed
+                    response_text, cached_text = cached_text, None
+                else:
+                    client = self._get_model(model)
+                    response = client.generate_content(prompt, generation_config=_JSON_GENERATION_CONFIG)
+                    response_text = response.text
                 
-                if not response.text:
+                if not response_text:
                     continue
                     
-                # Clean up any potential markdown formatting
-                json_str = response.text.strip()
-                if json_str.startswith("```json"):
-                    json_str = json_str[7:]
-                if json_str.startswith("```"):
-                    json_str = json_str[3:]
-                if json_str.endswith("```"):
-                    json_str = json_str[:-3]
-                    
-                json_str = json_str.strip()
-                parsed = json.loads(json_str)
+                # JSON mode returns the object itself, without markdown fences
+                parsed = _json_loads(response_text)
+                self._store_response(model, prompt, response_text)
                 return parsed
             except Exception as e:
                 print(f"LLM Rubric Parsing failed: {e}")
                 continue
                 
         return None
+
+
+# Process-wide service. Agents and routes share it, so setup runs once and
+# the per-instance response caches are reused across requests.
+_SERVICE: Optional[LLMService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_llm_service() -> LLMService:
+    """Return the shared LLMService, creating it on first use."""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = LLMService()
+    return _SERVICE
@@ -1,12 +1,29 @@
 import json
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType views."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively copy mappings (including read-only views) into plain dicts."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
 class Rubric:
     """Manages evaluation rubric structure, weights, and validation."""
 
-    DEFAULT_RUBRIC = {
+    # Read-only so instances can share it without defensive copies
+    DEFAULT_RUBRIC = _freeze({
         "name": "Standard Rubric",
         "version": "1.0",
         "dimensions": {
@@ -31,22 +48,31 @@ class Rubric:
                 },
             },
         },
-    }
+    })
 
     def __init__(self, rubric_dict: Optional[Dict[str, Any]] = None):
         """
         Initialize rubric from dict or use default.
 
         Args:
-            rubric_dict: Rubric dictionary, or None to use default
+            rubric_dict: Rubric dictionary, or None to use the shared
+                read-only default
         """
         if rubric_dict is None:
-            self.rubric = self.DEFAULT_RUBRIC.copy()
+            # The built-in default is known to be valid; skip validation
+            self.rubric = self.DEFAULT_RUBRIC
         else:
             self.rubric = rubric_dict
-
-        # Validate on initialization
-        self.validate()
+            # Validate user-supplied rubrics on initialization
+            self.validate()
+
+        # Cache per-dimension lookups; accessors are called per student
+        self._dimensions = self.rubric["dimensions"]
+        self._weights = {d: c["weight"] for d, c in self._dimensions.items()}
+        self._max_scores = {d: c["max_score"] for d, c in self._dimensions.items()}
+        self._total_max = round(
+            sum(self._max_scores[d] * self._weights[d] for d in self._dimensions), 2
+        )
 
     @staticmethod
     def from_json(json_path: str) -> "Rubric":
@@ -89,14 +115,14 @@ class Rubric:
         Raises:
             ValueError: If rubric structure is invalid
         """
-        if not isinstance(self.rubric, dict):
+        if not isinstance(self.rubric, Mapping):
             raise ValueError("Rubric must be a dictionary")
 
         if "dimensions" not in self.rubric:
             raise ValueError("Rubric must contain 'dimensions' key")
 
         dimensions = self.rubric["dimensions"]
-        if not isinstance(dimensions, dict):
+        if not isinstance(dimensions, Mapping):
             raise ValueError("'dimensions' must be a dictionary")
 
         # Validate required dimensions
@@ -112,7 +138,7 @@ class Rubric:
         # Validate each dimension
         total_weight = 0
         for dim_name, dim_config in dimensions.items():
-            if not isinstance(dim_config, dict):
+            if not isinstance(dim_config, Mapping):
                 raise ValueError(f"Dimension '{dim_name}' must be a dictionary")
 
             if "weight" not in dim_config:
@@ -151,10 +177,10 @@ class Rubric:
         Returns:
             Weight as a float
         """
-        if dimension not in self.rubric["dimensions"]:
+        if dimension not in self._dimensions:
             raise ValueError(f"Unknown dimension: {dimension}")
 
-        return self.rubric["dimensions"][dimension]["weight"]
+        return self._weights[dimension]
 
     def get_max_score(self, dimension: str) -> float:
         """
@@ -166,10 +192,10 @@ class Rubric:
         Returns:
             Max score as a float
         """
-        if dimension not in self.rubric["dimensions"]:
+        if dimension not in self._dimensions:
             raise ValueError(f"Unknown dimension: {dimension}")
 
-        return self.rubric["dimensions"][dimension]["max_score"]
+        return self._max_scores[dimension]
 
     def get_weights(self) -> Dict[str, float]:
         """
@@ -178,10 +204,7 @@ class Rubric:
         Returns:
             Dictionary of dimension names to weights
         """
-        return {
-            dim: config["weight"]
-            for dim, config in self.rubric["dimensions"].items()
-        }
+        return dict(self._weights)
 
     def get_max_scores(self) -> Dict[str, float]:
         """
@@ -190,10 +213,7 @@ class Rubric:
         Returns:
             Dictionary of dimension names to max scores
         """
-        return {
-            dim: config["max_score"]
-            for dim, config in self.rubric["dimensions"].items()
-        }
+        return dict(self._max_scores)
 
     def get_criteria(self, dimension: str) -> Dict[str, Dict[str, Any]]:
         """
@@ -205,10 +225,10 @@ class Rubric:
         Returns:
             Dictionary of criteria configurations
         """
-        if dimension not in self.rubric["dimensions"]:
+        if dimension not in self._dimensions:
             raise ValueError(f"Unknown dimension: {dimension}")
 
-        return self.rubric["dimensions"][dimension].get("criteria", {})
+        return self._dimensions[dimension].get("criteria", {})
 
     def get_dimension_config(self, dimension: str) -> Dict[str, Any]:
         """
@@ -220,10 +240,10 @@ class Rubric:
         Returns:
             Dictionary with dimension configuration
         """
-        if dimension not in self.rubric["dimensions"]:
+        if dimension not in self._dimensions:
             raise ValueError(f"Unknown dimension: {dimension}")
 
-        return self.rubric["dimensions"][dimension]
+        return self._dimensions[dimension]
 
     def get_total_max_score(self) -> float:
         """
@@ -232,20 +252,17 @@ class Rubric:
         Returns:
             Sum of all dimension max scores weighted by their weights
         """
-        total = sum(
-            self.get_max_score(dim) * self.get_weight(dim)
-            for dim in self.rubric["dimensions"]
-        )
-        return round(total, 2)
+        return self._total_max
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Export rubric as dictionary.
 
         Returns:
-            Rubric dictionary
+            Mutable deep copy of the rubric; editing it never affects this
+            rubric or the shared default
         """
-        return self.rubric.copy()
+        return _thaw(self.rubric)
 
     def to_json(self) -> str:
         """
@@ -254,4 +271,4 @@ class Rubric:
         Returns:
             JSON string representation
         """
-        return json.dumps(self.rubric, indent=2)
+        return json.dumps(self.to_dict(), indent=2)
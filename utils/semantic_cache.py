@@ -0,0 +1,343 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Recently computed embeddings kept for embed() after a batch prime()
+_EMBEDDING_MEMO_SIZE = 1024
+# Both embedding backends read at most this many tokens of a text
+_MAX_TOKENS = 256
+# Inserts per namespace between writes to disk; the rest is written on flush()
+_FLUSH_EVERY = 32
+
+
+class SemanticCache:
+    """
+    Near-duplicate response cache backed by sentence embeddings.
+
+    Entries are grouped into namespaces (e.g. one per problem/rubric) and hold
+    L2-normalized embeddings, so cosine similarity is a plain dot product.
+    A lookup returns the stored response of the most similar entry when its
+    similarity reaches the threshold.
+
+    Heavy dependencies (sentence-transformers, numpy) are imported lazily.
+    If they are not installed the cache disables itself and every lookup misses.
+
+    With onnx_path set, embeddings come from an int8-quantized ONNX export
+    of the model (see export_int8_onnx) run by onnxruntime, tokenized with
+    the model's transformers tokenizer. Vectors from the two backends are
+    close but not identical, so keep one backend per persist_dir.
+
+    Only texts the model reads in full are embedded: an embedding of a
+    truncated submission matches every submission that shares its opening
+    (e.g. a starter template), so longer texts always miss.
+
+    Persisted namespaces are written every few inserts and at exit, each
+    file replaced atomically. Workers sharing a persist_dir each write
+    their own view; the last writer wins.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        persist_dir: Optional[str] = None,
+        onnx_path: Optional[str] = None,
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self.onnx_path = onnx_path
+        self.enabled = True
+        self._model = None
+        self._tokenizer = None
+        self._memo: "OrderedDict[str, Any]" = OrderedDict()
+        self._namespaces: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.persist_dir:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def namespace_for(*parts: str) -> str:
+        """Build a stable namespace key from the inputs shared by all entries."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _ensure_model(self) -> bool:
+        """Lazy load of the embedding model with thread-safety."""
+        if self._model is not None or not self.enabled:
+            return self.enabled
+
+        with self._lock:
+            if self._model is not None:
+                return True
+            try:
+                if self.onnx_path:
+                    from onnxruntime import InferenceSession
+                    from transformers import AutoTokenizer
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    self._model = InferenceSession(self.onnx_path, providers=["CPUExecutionProvider"])
+                else:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+            except Exception as e:
+                print(f"WARNING: Semantic cache unavailable: {e}. Disabling semantic cache.")
+                self.enabled = False
+        return self.enabled
+
+    def embed(self, text: str):
+        """
+        Embed text into a normalized vector.
+
+        Returns:
+            1-D numpy array, or None if the cache is disabled or the text is
+            longer than the model reads.
+        """
+        with self._lock:
+            embedding = self._memo.get(text)
+        if embedding is not None:
+            return embedding
+
+        if not self._ensure_model() or not self._fits(text):
+            return None
+        embeddings = self.embed_batch([text])
+        return None if embeddings is None else embeddings[0]
+
+    def _fits(self, text: str) -> bool:
+        """Whether the model embeds the whole text rather than a truncated prefix."""
+        # At most one token per character, plus the two special tokens
+        if len(text) + 2 <= _MAX_TOKENS:
+            return True
+        # Far beyond the limit for any real submission; skip tokenizing it
+        if len(text) > 64 * _MAX_TOKENS:
+            return False
+        tokenizer = self._tokenizer or getattr(self._model, "tokenizer", None)
+        if tokenizer is None:
+            return False
+        return len(tokenizer(text, truncation=False)["input_ids"]) <= _MAX_TOKENS
+
+    def embed_batch(self, texts: List[str]):
+        """
+        Embed several texts in one forward pass.
+
+        Returns:
+            2-D numpy array with one normalized row per text, or None if the
+            cache is disabled.
+        """
+        if not self._ensure_model():
+            return None
+        if self._tokenizer is None:
+            return self._model.encode(texts, normalize_embeddings=True)
+
+        import numpy as np
+
+        tokens = self._tokenizer(
+            texts, padding=True, truncation=True, max_length=_MAX_TOKENS, return_tensors="np"
+        )
+        feeds = {
+            inp.name: tokens[inp.name].astype(np.int64)
+            for inp in self._model.get_inputs()
+            if inp.name in tokens
+        }
+        hidden = self._model.run(None, feeds)[0]
+        # Mean pooling over real tokens, as in the sentence-transformers model
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def prime(self, texts: List[str]) -> None:
+        """
+        Embed texts in one batch so later embed() calls for them are free.
+
+        Only the most recent embeddings are kept.
+        """
+        if not self._ensure_model():
+            return
+        texts = [text for text in dict.fromkeys(texts) if self._fits(text)]
+        if not texts:
+            return
+        embeddings = self.embed_batch(texts)
+        if embeddings is None:
+            return
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                self._memo[text] = embedding
+                self._memo.move_to_end(text)
+            while len(self._memo) > _EMBEDDING_MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def lookup(self, namespace: str, embedding, threshold: Optional[float] = None) -> Optional[Any]:
+        """
+        Find the cached response closest to the embedding.
+
+        Args:
+            namespace: Namespace key from namespace_for()
+            embedding: Normalized vector from embed()
+            threshold: Minimum cosine similarity for a hit; defaults to self.threshold
+
+        Returns:
+            Cached response, or None on a miss.
+        """
+        if embedding is None:
+            return None
+
+        entry = self._get_namespace(namespace)
+        # Read the count before the buffer: insert() swaps in a grown buffer
+        # before counting the new row, so these rows are always filled
+        count = entry["count"]
+        if not count:
+            return None
+
+        scores = entry["vectors"][:count] @ embedding
+        best = int(scores.argmax())
+        if scores[best] >= (self.threshold if threshold is None else threshold):
+            return entry["responses"][best]
+        return None
+
+    def insert(self, namespace: str, embedding, response: Any) -> None:
+        """
+        Store a response under the given embedding.
+
+        Args:
+            namespace: Namespace key from namespace_for()
+            embedding: Normalized vector from embed()
+            response: JSON-serializable response to return on similar lookups
+        """
+        if embedding is None:
+            return
+
+        import numpy as np
+
+        entry = self._get_namespace(namespace)
+        with self._lock:
+            row = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            vectors, count = entry["vectors"], entry["count"]
+            if vectors is None:
+                vectors = np.empty((16, row.shape[0]), dtype=np.float32)
+            elif count == len(vectors):
+                # Grow geometrically so appends stay amortized O(1)
+                grown = np.empty((max(16, 2 * len(vectors)), vectors.shape[1]), dtype=np.float32)
+                grown[:count] = vectors[:count]
+                vectors = grown
+            vectors[count] = row
+            # Response and row are in place before the count exposes them
+            entry["responses"].append(response)
+            entry["vectors"] = vectors
+            entry["count"] = count + 1
+            entry["unsaved"] += 1
+            snapshot = self._snapshot(entry) if entry["unsaved"] >= _FLUSH_EVERY else None
+
+        if snapshot is not None:
+            self._save(namespace, *snapshot)
+
+    def flush(self) -> None:
+        """Write namespaces with unsaved inserts to disk."""
+        if not self.persist_dir:
+            return
+        with self._lock:
+            snapshots = [
+                (namespace, self._snapshot(entry))
+                for namespace, entry in self._namespaces.items()
+                if entry["unsaved"]
+            ]
+        for namespace, snapshot in snapshots:
+            self._save(namespace, *snapshot)
+
+    def _snapshot(self, entry: Dict[str, Any]):
+        """Copy a namespace's rows for writing outside the lock (call under the lock)."""
+        if not self.persist_dir:
+            return None
+        entry["unsaved"] = 0
+        count = entry["count"]
+        return entry["vectors"][:count].copy(), list(entry["responses"][:count])
+
+    def _get_namespace(self, namespace: str) -> Dict[str, Any]:
+        entry = self._namespaces.get(namespace)
+        if entry is None:
+            # Load outside the lock; if another thread registered the
+            # namespace meanwhile, keep its entry (it may hold new rows)
+            loaded = self._load(namespace)
+            with self._lock:
+                entry = self._namespaces.setdefault(namespace, loaded)
+        return entry
+
+    def _load(self, namespace: str) -> Dict[str, Any]:
+        """Load a persisted namespace from disk, or start an empty one."""
+        entry: Dict[str, Any] = {"vectors": None, "responses": [], "count": 0, "unsaved": 0}
+        if not self.persist_dir:
+            return entry
+
+        vectors_path = self.persist_dir / f"{namespace}.npy"
+        responses_path = self.persist_dir / f"{namespace}.json"
+        if not vectors_path.exists() or not responses_path.exists():
+            return entry
+
+        try:
+            import numpy as np
+            vectors = np.load(vectors_path)
+            with open(responses_path, "r", encoding="utf-8") as f:
+                responses = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Failed to load semantic cache {namespace}: {e}")
+            return entry
+
+        # Files from an interrupted or concurrent write can disagree; a
+        # mismatched row would return another submission's response
+        if vectors.ndim != 2 or not isinstance(responses, list) or len(vectors) != len(responses):
+            print(f"WARNING: Semantic cache {namespace} is inconsistent on disk. Ignoring it.")
+            return entry
+
+        entry["vectors"] = vectors.astype(np.float32, copy=False)
+        entry["responses"] = responses
+        entry["count"] = len(responses)
+        return entry
+
+    def _save(self, namespace: str, vectors, responses: List[Any]) -> None:
+        """Persist a namespace so later runs can reuse it."""
+        try:
+            import numpy as np
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            # Write to temporary files and rename, so readers never see a
+            # partly written file
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            vectors_path = self.persist_dir / f"{namespace}.npy"
+            responses_path = self.persist_dir / f"{namespace}.json"
+            with open(f"{vectors_path}{suffix}", "wb") as f:
+                np.save(f, vectors)
+            with open(f"{responses_path}{suffix}", "w", encoding="utf-8") as f:
+                json.dump(responses, f)
+            os.replace(f"{vectors_path}{suffix}", vectors_path)
+            os.replace(f"{responses_path}{suffix}", responses_path)
+        except Exception as e:
+            print(f"WARNING: Failed to persist semantic cache {namespace}: {e}")
+
+def export_int8_onnx(output_path: str, model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> str:
+    """
+    Export an embedding model to ONNX and quantize its weights to int8.
+
+    One-off setup step for SemanticCache(onnx_path=...). Requires
+    `pip install optimum[onnxruntime]`.
+
+    Args:
+        output_path: Where to write the quantized .onnx file
+        model_name: Hugging Face model to export
+
+    Returns:
+        output_path
+    """
+    import tempfile
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        quantize_dynamic(str(Path(export_dir) / "model.onnx"), output_path, weight_type=QuantType.QInt8)
+    return output_path